@@ -1,13 +1,17 @@
-from flask import Flask
+from flask import Flask, Response
 from models import db
-from routes import register_blueprints
+from routes import register_blueprints, register_error_handlers
+import logging
 import os
-from config import config
+from config import get_config
 from logging_config import setup_logging, get_logger
-from middleware import init_request_logging
+from json_provider import PydanticJSONProvider
 
 logger = get_logger(__name__)
 
+# Health probes hit this constantly; encode the body once
+_HEALTH_BODY = b'healthy, thank you!'
+
 def config_setup(app):
     """Configure the Flask application with environment-specific settings.
     
@@ -15,7 +19,7 @@ def config_setup(app):
         app: The Flask application instance to configure.
     """
     config_name = os.environ.get('FLASK_ENV', 'default')
-    app.config.from_object(config[config_name]())
+    app.config.from_object(get_config(config_name))
     
     logger.info("Application configured", 
                 environment=config_name,
@@ -26,12 +30,19 @@ def config_setup(app):
 def setup_database(app):
     """Initialize the database and create tables if they don't exist.
     
+    Table creation inspects every table on each worker boot, so it can be
+    turned off with DB_CREATE_ALL=false once the schema is managed externally.
+    
     Args:
         app: The Flask application instance to configure database for.
     """
     # initialize database
     db.init_app(app)
 
+    if not app.config.get('DB_CREATE_ALL', True):
+        logger.info("Database initialized, table creation skipped")
+        return
+
     # create empty tables if they don't exist yet
     with app.app_context():
         db.create_all()
@@ -44,31 +55,39 @@ def setup_logging_middleware(app):
         app: The Flask application instance to configure middleware for.
     """
     if app.config.get('REQUEST_LOGGING_ENABLED', True):
+        # Imported here so processes with request logging disabled never load it
+        from middleware import init_request_logging
         init_request_logging(app)
+        # Our middleware already records every request; silence Werkzeug's
+        # duplicate access lines and keep only its errors
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
         logger.info("Request logging middleware initialized")
     else:
         logger.info("Request logging middleware disabled")
 
 if __name__ == '__main__':
-    setup_logging()  # Move this here
+    # Logging starts before the app exists, so read retention from the config directly
+    setup_logging(get_config(os.environ.get('FLASK_ENV', 'default')).LOG_RETENTION_DAYS)
     logger.info("Starting Flask application")
     
     app = Flask(__name__)
+    app.json = PydanticJSONProvider(app)
 
     config_setup(app)
     setup_database(app)
     setup_logging_middleware(app)
     register_blueprints(app)
+    register_error_handlers(app)
 
     @app.route('/health')
     def health_check():
         """Health check endpoint for monitoring application status.
         
         Returns:
-            str: A simple health status message.
+            Response: A simple plain-text health status message.
         """
         logger.debug("Health check requested")
-        return 'healthy, thank you!'
+        return Response(_HEALTH_BODY, mimetype='text/plain')
 
     logger.info("Flask application ready to start", 
                 host='0.0.0.0', 
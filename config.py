@@ -1,4 +1,23 @@
+import functools
 import os
+from sqlalchemy.pool import StaticPool
+
+# Values accepted as "on" for boolean environment flags
+_TRUTHY = frozenset(('true', '1', 'yes', 'on'))
+
+
+def _env_flag(name, default):
+    """Read a boolean flag from the environment.
+    
+    Args:
+        name (str): Environment variable name.
+        default (str): Value to use when the variable is unset.
+        
+    Returns:
+        bool: True if the value is one of the accepted truthy strings.
+    """
+    return os.environ.get(name, default).lower() in _TRUTHY
+
 
 class Config:
     """Base configuration class for the Flask application.
@@ -13,23 +32,27 @@ class Config:
         LOG_LEVEL: Logging level for the application.
         LOG_DIR: Directory for log files.
         REQUEST_LOGGING_ENABLED: Enable/disable request logging.
-        LOG_RETENTION_DAYS: Number of days to retain log files.
+        LOG_RETENTION_DAYS: Number of days to retain log files; logs rotate daily
+            at UTC midnight and one file is kept per day. Must be at least 1.
+        DB_CREATE_ALL: Create missing tables at startup; disable when the schema is managed externally.
+        LOG_EXCLUDE_PATHS: Request paths the request logging middleware ignores.
     """
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    LOG_EXCLUDE_PATHS = frozenset(('/health',))
     
     def __init__(self):
         """Initialize configuration with environment variables."""
         self.SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
         self.SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///app.db'
+        self.DB_CREATE_ALL = _env_flag('DB_CREATE_ALL', 'true')
         
         # Logging configuration
         self.LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
         self.LOG_DIR = os.environ.get('LOG_DIR') or 'logs'
-        request_logging_enabled = os.environ.get('REQUEST_LOGGING_ENABLED', 'true').lower()
-        self.REQUEST_LOGGING_ENABLED = request_logging_enabled in ('true', '1', 'yes', 'on')
+        self.REQUEST_LOGGING_ENABLED = _env_flag('REQUEST_LOGGING_ENABLED', 'true')
         self.LOG_RETENTION_DAYS = int(os.environ.get('LOG_RETENTION_DAYS', '30'))
-        self.LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES', '10485760'))  # 10MB
-        self.LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT', '5'))
+        if self.LOG_RETENTION_DAYS < 1:
+            raise ValueError(f"LOG_RETENTION_DAYS must be at least 1, got {self.LOG_RETENTION_DAYS}")
 
 class DevelopmentConfig(Config):
     """Development environment configuration.
@@ -67,6 +90,11 @@ class ConfigTesting(Config):
         """Initialize testing configuration."""
         super().__init__()
         self.SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+        # One shared in-memory connection, usable from the test client's threads
+        self.SQLALCHEMY_ENGINE_OPTIONS = {
+            'poolclass': StaticPool,
+            'connect_args': {'check_same_thread': False}
+        }
         self.REQUEST_LOGGING_ENABLED = False  # Disable request logging in tests
         self.LOG_LEVEL = 'WARNING'
 
@@ -76,3 +104,19 @@ config = {
     'testing': ConfigTesting,
     'default': DevelopmentConfig
 }
+
+
+@functools.lru_cache(maxsize=None)
+def get_config(name):
+    """Get the configuration object for an environment, built once per process.
+    
+    Environment variables are read the first time a name is requested; later
+    calls (repeated app creation, pre-fork workers) reuse the same object.
+    
+    Args:
+        name (str): Key into ``config``, e.g. 'development' or 'testing'.
+        
+    Returns:
+        Config: The configuration instance for *name*.
+    """
+    return config[name]()
@@ -0,0 +1,62 @@
+from flask.json.provider import DefaultJSONProvider
+from pydantic_core import from_json, to_json
+
+
+class PydanticJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by pydantic-core's Rust JSON encoder/decoder.
+
+    Used by ``jsonify``, ``request.get_json`` and the test client. Responses
+    are encoded straight to UTF-8 bytes, and values the encoder doesn't know
+    fall back to Flask's ``default`` handling. Keys keep insertion order
+    rather than being sorted.
+    """
+
+    def dumps(self, obj, **kwargs):
+        """Serialize data as JSON to a string.
+
+        Args:
+            obj: The data to serialize.
+            **kwargs: ``indent`` and ``default`` are honoured; other
+                ``json.dumps`` options are ignored.
+
+        Returns:
+            str: The JSON document.
+        """
+        return self._encode(obj, **kwargs).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON from a string or bytes.
+
+        Args:
+            s: Text or UTF-8 bytes.
+            **kwargs: Ignored; accepted for ``json.loads`` compatibility.
+
+        Returns:
+            The decoded Python object.
+
+        Raises:
+            ValueError: If *s* is not valid JSON.
+        """
+        return from_json(s)
+
+    def response(self, *args, **kwargs):
+        """Serialize the given arguments as a JSON response.
+
+        Mirrors ``DefaultJSONProvider.response`` (indented output in debug
+        mode or when ``compact`` is False) but skips the intermediate str.
+
+        Returns:
+            Response: Response with the JSON body and ``application/json`` mimetype.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = None
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            indent = 2
+
+        return self._app.response_class(
+            self._encode(obj, indent=indent) + b"\n", mimetype=self.mimetype
+        )
+
+    def _encode(self, obj, indent=None, default=None, **kwargs):
+        """Encode *obj* to JSON bytes."""
+        return to_json(obj, indent=indent, fallback=default or self.default)
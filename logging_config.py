@@ -1,17 +1,69 @@
 import structlog
+import atexit
+import functools
 import logging
 import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
 import json
+from pydantic_core import to_json
 
 
-def setup_logging():
+# Background thread that drains queued log records into the file handlers.
+_queue_listener = None
+_setup_lock = threading.Lock()
+
+
+def _stop_queue_listener():
+    """Flush pending log records to disk and stop the background writer."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
+def _json_dumps(obj, default=None):
+    """Serialize a log event with pydantic-core's Rust JSON encoder.
+    
+    Drop-in replacement for ``json.dumps`` as a structlog serializer; bytes
+    values are decoded as UTF-8 and unknown types are passed to *default*.
+    
+    Args:
+        obj: The event dict to serialize.
+        default (callable, optional): Fallback for unserializable values.
+        
+    Returns:
+        str: The JSON document.
+    """
+    return to_json(obj, fallback=default).decode()
+
+
+def setup_logging(retention_days=30):
     """Configure structlog for request logging.
     
     Sets up structured logging with JSON format, log rotation, and appropriate
-    processors for development and production environments.
+    processors for development and production environments. File handlers sit
+    behind a queue so request threads only enqueue records; a background
+    listener thread does the disk writes and rotation.
+    
+    Args:
+        retention_days (int, optional): Daily log files kept per log, normally
+            the config's ``LOG_RETENTION_DAYS``. Defaults to 30.
+            
+    Raises:
+        ValueError: If *retention_days* is less than 1.
     """
+    global _queue_listener
+    
+    if retention_days < 1:
+        # backupCount=0 would mean "never delete", the opposite of a short retention
+        raise ValueError(f"retention_days must be at least 1, got {retention_days}")
+    
     # Configure standard library logging
     logging.basicConfig(
         format="%(message)s",
@@ -35,25 +87,44 @@ def setup_logging():
             if not os.path.exists(log_dir):
                 log_dir = '.'
     
-    # Add rotating file handler
-    file_handler = logging.handlers.RotatingFileHandler(
+    # Add rotating file handler. Rotate daily and keep one file per retained
+    # day; time-based rollover is a clock comparison per record, where
+    # size-based rollover stats and seeks the file and formats each record twice.
+    file_handler = logging.handlers.TimedRotatingFileHandler(
         filename=os.path.join(log_dir, 'user_server.log'),
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        when='midnight',
+        backupCount=retention_days,
+        delay=True,
+        utc=True
     )
     file_handler.setLevel(logging.INFO)
     
     # Add request log handler
-    request_handler = logging.handlers.RotatingFileHandler(
+    request_handler = logging.handlers.TimedRotatingFileHandler(
         filename=os.path.join(log_dir, 'requests.log'),
-        maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=10
+        when='midnight',
+        backupCount=retention_days,
+        delay=True,
+        utc=True
     )
     request_handler.setLevel(logging.INFO)
+    request_handler.addFilter(logging.Filter('requests'))
+    
+    # Route file output through a queue so disk I/O happens off the request thread
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, request_handler, respect_handler_level=True
+    )
     
-    # Add handlers to root logger
     root_logger = logging.getLogger()
-    root_logger.addHandler(file_handler)
+    with _setup_lock:
+        _stop_queue_listener()
+        for handler in root_logger.handlers[:]:
+            if isinstance(handler, logging.handlers.QueueHandler):
+                root_logger.removeHandler(handler)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        listener.start()
+        _queue_listener = listener
     
     # Configure structlog
     structlog.configure(
@@ -65,8 +136,7 @@ def setup_logging():
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(serializer=_json_dumps)
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -75,9 +145,12 @@ def setup_logging():
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(name=None):
     """Get a structlog logger instance.
     
+    Loggers are cached per name, so repeated calls return the same instance.
+    
     Args:
         name (str, optional): Logger name. Defaults to None.
         
@@ -93,4 +166,4 @@ def get_request_logger():
     Returns:
         structlog.BoundLogger: Logger configured for request logging.
     """
-    return structlog.get_logger("requests") 
\ No newline at end of file
+    return get_logger("requests") 
\ No newline at end of file
@@ -1,10 +1,62 @@
+import logging
+import os
+import threading
 import time
-import uuid
 from flask import request, g
 from logging_config import get_request_logger
 import structlog
 
 
+# Request IDs are 16 random bytes rendered as 32 hex characters. Entropy is
+# drawn from the OS in 4 KiB chunks and handed out per thread, so most requests
+# get their ID without a syscall or a UUID object.
+REQUEST_ID_BYTES = 16
+ENTROPY_POOL_BYTES = 4096
+
+_entropy = threading.local()
+
+# Only these request headers are copied into the "Request started" record;
+# anything else (cookies, auth tokens) stays out of the logs.
+LOGGED_HEADERS = ('User-Agent', 'Content-Type', 'X-Forwarded-For', 'X-Real-IP', 'Referer')
+
+
+def _reset_entropy_pool():
+    """Discard pooled entropy so forked workers never share request IDs."""
+    global _entropy
+    _entropy = threading.local()
+
+
+os.register_at_fork(after_in_child=_reset_entropy_pool)
+
+
+def next_request_id():
+    """Return a new request ID from the calling thread's entropy pool.
+    
+    Returns:
+        str: 32 lowercase hex characters.
+    """
+    pool = _entropy
+    buf = getattr(pool, 'buf', b'')
+    off = getattr(pool, 'off', 0)
+    if off + REQUEST_ID_BYTES > len(buf):
+        buf = pool.buf = os.urandom(ENTROPY_POOL_BYTES)
+        off = 0
+    pool.off = off + REQUEST_ID_BYTES
+    return buf[off:off + REQUEST_ID_BYTES].hex()
+
+
+def elapsed_us():
+    """Return whole microseconds since before_request stamped ``g.start_ns``.
+    
+    Returns:
+        int: Elapsed microseconds, or 0 if the start time was never recorded.
+    """
+    start_ns = g.get('start_ns')
+    if start_ns is None:
+        return 0
+    return (time.perf_counter_ns() - start_ns) // 1000
+
+
 class RequestLoggingMiddleware:
     """Middleware for logging all Flask requests and responses.
     
@@ -20,6 +72,7 @@ class RequestLoggingMiddleware:
         """
         self.app = app
         self.logger = get_request_logger()
+        self.exclude_paths = frozenset()
         
         if app is not None:
             self.init_app(app)
@@ -30,14 +83,30 @@ class RequestLoggingMiddleware:
         Args:
             app (Flask): Flask application instance.
         """
+        self.exclude_paths = frozenset(app.config.get('LOG_EXCLUDE_PATHS', ()))
+        
         app.before_request(self.before_request)
         app.after_request(self.after_request)
         app.teardown_appcontext(self.teardown_request)
     
     def before_request(self):
         """Execute before each request to capture start time and request ID."""
-        g.start_time = time.time()
-        g.request_id = str(uuid.uuid4())
+        # Probes such as /health skip request logging entirely
+        if request.path in self.exclude_paths:
+            g.skip_request_log = True
+            return
+        
+        g.start_ns = time.perf_counter_ns()
+        g.request_id = next_request_id()
+        headers = request.headers
+        
+        # Resolve these once; after_request and teardown_request reuse them
+        g.client_ip = self.get_client_ip()
+        g.user_agent = headers.get('User-Agent', 'Unknown')
+        
+        # Don't build the log record at all if INFO is filtered out
+        if not self.info_enabled():
+            return
         
         # Log the incoming request
         self.logger.info(
@@ -46,12 +115,12 @@ class RequestLoggingMiddleware:
             method=request.method,
             url=request.url,
             path=request.path,
-            remote_addr=self.get_client_ip(),
-            user_agent=request.headers.get('User-Agent', 'Unknown'),
-            content_type=request.headers.get('Content-Type', 'Unknown'),
-            content_length=request.headers.get('Content-Length', 0),
+            remote_addr=g.client_ip,
+            user_agent=g.user_agent,
+            content_type=headers.get('Content-Type', 'Unknown'),
+            content_length=headers.get('Content-Length', 0),
             query_params=dict(request.args),
-            headers=dict(request.headers),
+            headers={name: headers[name] for name in LOGGED_HEADERS if name in headers},
             is_json=request.is_json
         )
     
@@ -64,8 +133,18 @@ class RequestLoggingMiddleware:
         Returns:
             response: The unmodified response object.
         """
+        if g.get('skip_request_log'):
+            return response
+        
+        # Add request ID to response headers for tracking
+        response.headers['X-Request-ID'] = getattr(g, 'request_id', 'unknown')
+        
+        # Don't build the log record at all if INFO is filtered out
+        if not self.info_enabled():
+            return response
+        
         # Calculate request duration
-        duration = time.time() - g.start_time if hasattr(g, 'start_time') else 0
+        duration_us = elapsed_us()
         
         # Log the response
         self.logger.info(
@@ -76,16 +155,13 @@ class RequestLoggingMiddleware:
             path=request.path,
             status_code=response.status_code,
             status=response.status,
-            duration_seconds=round(duration, 4),
-            response_size=len(response.get_data()) if response.get_data() else 0,
+            duration_us=duration_us,
+            response_size=response.calculate_content_length() or 0,
             content_type=response.headers.get('Content-Type', 'Unknown'),
-            remote_addr=self.get_client_ip(),
-            user_agent=request.headers.get('User-Agent', 'Unknown')
+            remote_addr=g.get('client_ip') or self.get_client_ip(),
+            user_agent=g.get('user_agent') or request.headers.get('User-Agent', 'Unknown')
         )
         
-        # Add request ID to response headers for tracking
-        response.headers['X-Request-ID'] = getattr(g, 'request_id', 'unknown')
-        
         return response
     
     def teardown_request(self, exception=None):
@@ -95,7 +171,7 @@ class RequestLoggingMiddleware:
             exception: Exception that occurred during request processing, if any.
         """
         if exception:
-            duration = time.time() - g.start_time if hasattr(g, 'start_time') else 0
+            duration_us = elapsed_us()
             
             self.logger.error(
                 "Request failed with exception",
@@ -103,27 +179,41 @@ class RequestLoggingMiddleware:
                 method=request.method,
                 url=request.url,
                 path=request.path,
-                duration_seconds=round(duration, 4),
+                duration_us=duration_us,
                 exception=str(exception),
                 exception_type=type(exception).__name__,
-                remote_addr=self.get_client_ip(),
-                user_agent=request.headers.get('User-Agent', 'Unknown')
+                remote_addr=g.get('client_ip') or self.get_client_ip(),
+                user_agent=g.get('user_agent') or request.headers.get('User-Agent', 'Unknown')
             )
     
+    def info_enabled(self):
+        """Check whether the request logger will emit INFO records.
+        
+        Returns:
+            bool: True if INFO-level request records are enabled.
+        """
+        try:
+            return self.logger.isEnabledFor(logging.INFO)
+        except AttributeError:
+            # structlog's native loggers, used until setup_logging() runs
+            return self.logger.is_enabled_for(logging.INFO)
+    
     def get_client_ip(self):
         """Get the client's IP address, accounting for proxies.
         
         Returns:
             str: Client IP address.
         """
+        headers = request.headers
+        
         # Check for forwarded headers (common in production deployments)
-        forwarded_for = request.headers.get('X-Forwarded-For')
+        forwarded_for = headers.get('X-Forwarded-For')
         if forwarded_for:
             # Take the first IP if multiple are present
-            return forwarded_for.split(',')[0].strip()
+            return forwarded_for.split(',', 1)[0].strip()
         
         # Check for real IP header
-        real_ip = request.headers.get('X-Real-IP')
+        real_ip = headers.get('X-Real-IP')
         if real_ip:
             return real_ip
         
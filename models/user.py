@@ -11,7 +11,7 @@ class User(db.Model):
         username: User's username, up to 50 characters.
         email: User's email address, up to 100 characters.
         age: User's age as an integer.
-        role: User's role in the system, up to 20 characters.
+        role: User's role in the system, up to 20 characters. Indexed for role listings.
     """
     __tablename__ = 'users'
 
@@ -19,7 +19,7 @@ class User(db.Model):
     username: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
     email: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
     age: Mapped[int] = mapped_column(Integer, nullable=False)
-    role: Mapped[str] = mapped_column(String(20), nullable=False)
+    role: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
     
     def to_dict(self):
         """Convert the User instance to a dictionary.
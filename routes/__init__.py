@@ -1,4 +1,5 @@
 from .users import users_bp
+from .errors import register_error_handlers
 
 def register_blueprints(app):
     """Register all application blueprints with the Flask app.
@@ -0,0 +1,64 @@
+import sys
+from flask import Response, current_app
+from werkzeug.exceptions import HTTPException
+from schemas.error_schemas import ErrorResponseBuilder
+
+# These payloads never vary, so serialize them once at import instead of
+# building and dumping an ErrorResponse for every stray request.
+_NOT_FOUND_BODY = ErrorResponseBuilder.not_found("Resource").model_dump_json()
+_INTERNAL_ERROR_BODY = ErrorResponseBuilder.internal_server_error().model_dump_json()
+
+
+def handle_not_found(error):
+    """Return the standard JSON error envelope for unknown URLs.
+    
+    Args:
+        error: The NotFound exception raised by Werkzeug routing.
+        
+    Returns:
+        Response: Pre-serialized 404 JSON response.
+    """
+    return Response(_NOT_FOUND_BODY, status=404, mimetype='application/json')
+
+
+def handle_internal_error(error):
+    """Return the standard JSON error envelope for unhandled server errors.
+    
+    Args:
+        error: The InternalServerError raised while handling the request.
+        
+    Returns:
+        Response: Pre-serialized 500 JSON response.
+    """
+    return Response(_INTERNAL_ERROR_BODY, status=500, mimetype='application/json')
+
+
+def handle_unexpected_error(error):
+    """Answer any exception a view did not handle with the JSON 500 envelope.
+    
+    Registered for ``Exception`` so it also applies when Flask would otherwise
+    propagate the error (``TESTING``, ``debug=True``). HTTP errors raised on
+    purpose (``abort(404)`` and the like) are returned unchanged.
+    
+    Args:
+        error: The exception raised while handling the request.
+        
+    Returns:
+        Response: The HTTP error itself, or the pre-serialized 500 JSON response.
+    """
+    if isinstance(error, HTTPException):
+        return error
+    # The handler swallows the exception, so log it the way Flask would have
+    current_app.log_exception(sys.exc_info())
+    return Response(_INTERNAL_ERROR_BODY, status=500, mimetype='application/json')
+
+
+def register_error_handlers(app):
+    """Register application-wide JSON error handlers with the Flask app.
+    
+    Args:
+        app: The Flask application instance to register handlers with.
+    """
+    app.register_error_handler(404, handle_not_found)
+    app.register_error_handler(500, handle_internal_error)
+    app.register_error_handler(Exception, handle_unexpected_error)
@@ -1,5 +1,7 @@
-from flask import Blueprint, jsonify, request
+import functools
+from flask import Blueprint, current_app, request
 from pydantic import ValidationError
+from pydantic_core import to_json
 from services.user_service import UserService
 from schemas.user_schemas import UserSchema, UserResponseSchema, UserCreateSchema, UserUpdateSchema
 from schemas.error_schemas import ErrorResponseBuilder, ErrorCode
@@ -10,55 +12,132 @@ users_bp = Blueprint('users', __name__, url_prefix='/api/users')
 # Helper utilities shared by multiple routes
 # ---------------------------------------------------------------------------
 
+# These error payloads never vary, so serialize them once at import instead of
+# building and dumping an ErrorResponse for every bad request.
+_NOT_JSON_BODY = ErrorResponseBuilder.invalid_json("Request must have JSON content type").model_dump_json()
+_BAD_JSON_BODY = ErrorResponseBuilder.invalid_json("Request body must be valid JSON").model_dump_json()
+_NO_FIELDS_BODY = ErrorResponseBuilder.invalid_json("At least one field must be provided for update").model_dump_json()
+
+# Listing body for an empty table or a role nobody has
+_EMPTY_USERS_BODY = UserResponseSchema(users=[]).model_dump_json()
+
+def _json_response(body, status):
+    """Wrap an already-serialized JSON *body* in a response with *status*."""
+
+    return current_app.response_class(body, status=status, mimetype='application/json')
+
+class _InvalidRequestBody(Exception):
+    """Raised by :func:`_parse_json_body` with the 400 response to return."""
+
+    def __init__(self, response):
+        super().__init__(response.status)
+        self.response = response
+
 def _parse_json_body(schema_cls):
     """Parse request JSON and validate against *schema_cls*.
 
-    Returns a tuple *(validated_model, error_response, status_code)* where
-    *validated_model* is the parsed Pydantic model instance on success.
-    When the request is invalid, *validated_model* is ``None`` and the second
-    and third tuple elements contain an ``ErrorResponse`` and HTTP status code
-    respectively.  This keeps route handlers concise and consistent.
+    Returns the validated Pydantic model instance.  When the request is
+    invalid, raises :class:`_InvalidRequestBody` carrying a ready-to-return
+    400 JSON response, so the success path does no error bookkeeping.
     """
 
     if not request.is_json:
-        return None, ErrorResponseBuilder.invalid_json("Request must have JSON content type"), 400
+        raise _InvalidRequestBody(_json_response(_NOT_JSON_BODY, 400))
 
+    # Content type is already checked, so parse and validate the raw body in
+    # one pydantic-core pass rather than decoding it to Python objects first
     try:
-        json_data = request.get_json()
-    except Exception:
-        return None, ErrorResponseBuilder.invalid_json("Request body must be valid JSON"), 400
+        return schema_cls.model_validate_json(request.get_data(cache=False))
+    except ValidationError as exc:
+        first = exc.errors()[0]
+        if first['type'] == 'json_invalid' or (first['type'] == 'model_type' and first['input'] is None):
+            # Unparseable body, or a bare JSON null
+            raise _InvalidRequestBody(_json_response(_BAD_JSON_BODY, 400)) from None
+        raise _InvalidRequestBody(
+            _json_response(ErrorResponseBuilder.pydantic_validation_error(exc).model_dump_json(), 400)
+        ) from None
 
-    if json_data is None:
-        return None, ErrorResponseBuilder.invalid_json("Request body must be valid JSON"), 400
+@users_bp.errorhandler(_InvalidRequestBody)
+def _handle_invalid_request_body(exc):
+    """Return the 400 response carried by an :class:`_InvalidRequestBody`."""
 
-    try:
-        return schema_cls(**json_data), None, None
-    except ValidationError as exc:
-        return None, ErrorResponseBuilder.pydantic_validation_error(exc), 400
+    return exc.response
+
+@functools.lru_cache(maxsize=1024)
+def _user_not_found_body(id):
+    """Return the serialized 404 body for user *id*, cached for repeat misses."""
+
+    return ErrorResponseBuilder.not_found("User", id).model_dump_json()
+
+# HTTP status for each service-layer ErrorCode; anything unlisted is a 500
+_STATUS_BY_CODE = {
+    ErrorCode.RESOURCE_NOT_FOUND: 404,
+    ErrorCode.RESOURCE_ALREADY_EXISTS: 409,
+    ErrorCode.CONSTRAINT_VIOLATION: 409,
+    ErrorCode.DATABASE_ERROR: 500,
+    ErrorCode.VALIDATION_ERROR: 400,
+    ErrorCode.INVALID_JSON: 400,
+}
 
 def _error_status(err):
     """Map our ErrorCode enum to an HTTP status code."""
 
-    mapping = {
-        ErrorCode.RESOURCE_NOT_FOUND: 404,
-        ErrorCode.RESOURCE_ALREADY_EXISTS: 409,
-        ErrorCode.CONSTRAINT_VIOLATION: 409,
-        ErrorCode.DATABASE_ERROR: 500,
-        ErrorCode.VALIDATION_ERROR: 400,
-        ErrorCode.INVALID_JSON: 400,
-    }
-    return mapping.get(err.code, 500)
+    return _STATUS_BY_CODE.get(err.code, 500)
+
+def _user_response(user, status):
+    """Serialize a single ORM *user* as a ``UserSchema`` JSON response.
+
+    ``model_validate`` reads the ORM attributes in pydantic-core, which is
+    faster than assembling the fields in Python for ``model_construct``.
+    """
+
+    userResponse = UserSchema.model_validate(user)
+    return _json_response(userResponse.model_dump_json(), status)
+
+def _listing_response(body):
+    """Wrap a serialized user listing in a conditional JSON response.
+
+    The response carries a strong ``ETag`` derived from the body, so clients
+    that replay it via ``If-None-Match`` receive an empty ``304 Not Modified``
+    instead of the full listing.
+    """
+
+    response = current_app.response_class(body, mimetype='application/json')
+    response.add_etag()
+    return response.make_conditional(request)
+
+def _users_json(users):
+    """Serialize ORM *users* to a JSON array of user objects.
+
+    Rows read back from the database already satisfy the column types, so
+    they go straight to pydantic-core's encoder via ``User.to_dict`` rather
+    than being validated into ``UserSchema`` instances first.
+    """
+
+    return to_json([user.to_dict() for user in users])
+
+def _users_response(batches):
+    """Serialize batches of ORM users into a conditional ``UserResponseSchema``-shaped JSON response.
+
+    Only one batch of ORM objects is alive at a time; each is encoded as it
+    arrives and the fragments are joined once at the end.
+    """
+
+    # Each batch serializes to "[...]"; keep the inner items for splicing
+    items = [_users_json(batch)[1:-1] for batch in batches]
+    if not items:
+        return _listing_response(_EMPTY_USERS_BODY)
+    return _listing_response(b'{"users":[' + b','.join(items) + b']}')
 
 @users_bp.route('', methods=['GET'])
 def get_all_users():
     """Get all users from the database.
     
     Returns:
-        Response: JSON response containing all users wrapped in UserResponseSchema.
+        Response: JSON response containing all users wrapped in UserResponseSchema,
+        or an empty 304 response when ``If-None-Match`` matches its ETag.
     """
-    users = UserService.get_all_users()
-    usersResponse = UserResponseSchema(users=[UserSchema.model_validate(user) for user in users])
-    return jsonify(usersResponse.model_dump())
+    return _users_response(UserService.iter_all_users())
 
 @users_bp.route('/role/<role>', methods=['GET'])
 def get_users_by_role(role):
@@ -68,11 +147,10 @@ def get_users_by_role(role):
         role (str): The role to filter users by.
         
     Returns:
-        Response: JSON response containing users with the specified role.
+        Response: JSON response containing users with the specified role,
+        or an empty 304 response when ``If-None-Match`` matches its ETag.
     """
-    users = UserService.get_users_by_role(role=role)
-    usersResponse = UserResponseSchema(users=[UserSchema.model_validate(user) for user in users])
-    return jsonify(usersResponse.model_dump())
+    return _users_response(UserService.iter_users_by_role(role=role))
 
 @users_bp.route('/<int:id>', methods=['GET'])
 def get_user(id):
@@ -90,11 +168,9 @@ def get_user(id):
     """
     user = UserService.get_user(id=id)
     if not user:
-        error_response = ErrorResponseBuilder.not_found("User", id)
-        return jsonify(error_response.model_dump()), 404
+        return _json_response(_user_not_found_body(id), 404)
     
-    userResponse = UserSchema.model_validate(user)
-    return jsonify(userResponse.model_dump())
+    return _user_response(user, 200)
 
 @users_bp.route('/<int:id>', methods=['DELETE'])
 def delete_user(id):
@@ -113,8 +189,7 @@ def delete_user(id):
     """
     success, error_response = UserService.delete_user(id=id)
     if not success:
-        status_code = 404 if error_response.code == "RESOURCE_NOT_FOUND" else 500
-        return jsonify(error_response.model_dump()), status_code
+        return _json_response(error_response.model_dump_json(), _error_status(error_response))
     
     return '', 204
 
@@ -134,32 +209,22 @@ def create_user():
         409: User with same username or email already exists.
         500: Internal server error during user creation.
     """
-    try:
-        validatedUserRequest, err, status = _parse_json_body(UserCreateSchema)
-        if err:
-            return jsonify(err.model_dump()), status
-        
-        # Create user
-        user, error_response = UserService.create_user(
-            validatedUserRequest.username,
-            validatedUserRequest.email,
-            validatedUserRequest.age,
-            validatedUserRequest.role
-        )
-        
-        # Handle service errors
-        if error_response:
-            return jsonify(error_response.model_dump()), _error_status(error_response)
-        
-        # Return created user
-        userResponse = UserSchema.model_validate(user)
-        return jsonify(userResponse.model_dump()), 201
-        
-    except Exception as e:
-        error_response = ErrorResponseBuilder.internal_server_error(
-            "An unexpected error occurred while processing the request"
-        )
-        return jsonify(error_response.model_dump()), 500
+    validatedUserRequest = _parse_json_body(UserCreateSchema)
+    
+    # Create user
+    user, error_response = UserService.create_user(
+        validatedUserRequest.username,
+        validatedUserRequest.email,
+        validatedUserRequest.age,
+        validatedUserRequest.role
+    )
+    
+    # Handle service errors
+    if error_response:
+        return _json_response(error_response.model_dump_json(), _error_status(error_response))
+    
+    # Return created user
+    return _user_response(user, 201)
 
 @users_bp.route('/<int:id>', methods=['PATCH'])
 def update_user(id):
@@ -181,32 +246,21 @@ def update_user(id):
         409: User with same username or email already exists.
         500: Internal server error during user update.
     """
-    try:
-        validatedUserRequest, err, status = _parse_json_body(UserUpdateSchema)
-        if err:
-            return jsonify(err.model_dump()), status
-        
-        # Filter out None values to only update provided fields
-        update_data = {k: v for k, v in validatedUserRequest.model_dump().items() if v is not None}
-        
-        # If no fields to update, return validation error
-        if not update_data:
-            error_response = ErrorResponseBuilder.invalid_json("At least one field must be provided for update")
-            return jsonify(error_response.model_dump()), 400
-        
-        # Update user
-        user, error_response = UserService.update_user(id, update_data)
-        
-        # Handle service errors
-        if error_response:
-            return jsonify(error_response.model_dump()), _error_status(error_response)
-        
-        # Return updated user
-        userResponse = UserSchema.model_validate(user)
-        return jsonify(userResponse.model_dump()), 200
-        
-    except Exception as e:
-        error_response = ErrorResponseBuilder.internal_server_error(
-            "An unexpected error occurred while processing the request"
-        )
-        return jsonify(error_response.model_dump()), 500
+    validatedUserRequest = _parse_json_body(UserUpdateSchema)
+    
+    # Filter out None values to only update provided fields
+    update_data = validatedUserRequest.model_dump(exclude_none=True)
+    
+    # If no fields to update, return validation error
+    if not update_data:
+        return _json_response(_NO_FIELDS_BODY, 400)
+    
+    # Update user
+    user, error_response = UserService.update_user(id, update_data)
+    
+    # Handle service errors
+    if error_response:
+        return _json_response(error_response.model_dump_json(), _error_status(error_response))
+    
+    # Return updated user
+    return _user_response(user, 200)
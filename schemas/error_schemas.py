@@ -31,6 +31,22 @@ class ErrorCode(str, Enum):
     INTERNAL_SERVER_ERROR = "INTERNAL_SERVER_ERROR"
 
 
+# Pydantic error types with a more specific ErrorCode than VALIDATION_ERROR
+_PYDANTIC_ERROR_MAP = {
+    'missing': ErrorCode.MISSING_REQUIRED_FIELD,
+    'string_too_short': ErrorCode.VALUE_TOO_SHORT,
+    'too_short': ErrorCode.VALUE_TOO_SHORT,
+    'string_too_long': ErrorCode.VALUE_TOO_LONG,
+    'too_long': ErrorCode.VALUE_TOO_LONG,
+    'int_parsing': ErrorCode.INVALID_DATA_TYPE,
+    'float_parsing': ErrorCode.INVALID_DATA_TYPE,
+    'bool_parsing': ErrorCode.INVALID_DATA_TYPE,
+    'string_type': ErrorCode.INVALID_DATA_TYPE,
+    'int_type': ErrorCode.INVALID_DATA_TYPE,
+    'value_error': ErrorCode.INVALID_FORMAT,
+}
+
+
 class FieldError(BaseModel):
     """Schema for field-specific error details."""
     
@@ -129,28 +145,13 @@ class ErrorResponseBuilder:
         error_messages = []
         
         for error in validation_error.errors():
-            field_path = '.'.join(str(loc) for loc in error['loc'])
+            field_path = '.'.join(map(str, error['loc']))
             error_type = error['type']
             error_msg = error['msg']
             input_value = error.get('input')
             
             # Map Pydantic error types to our error codes
-            if error_type == 'missing':
-                code = ErrorCode.MISSING_REQUIRED_FIELD
-            elif error_type in ['string_too_short', 'too_short']:
-                code = ErrorCode.VALUE_TOO_SHORT
-            elif error_type in ['string_too_long', 'too_long']:
-                code = ErrorCode.VALUE_TOO_LONG
-            elif error_type in ['int_parsing', 'float_parsing', 'bool_parsing']:
-                code = ErrorCode.INVALID_DATA_TYPE
-            elif error_type == 'string_type':
-                code = ErrorCode.INVALID_DATA_TYPE
-            elif error_type == 'int_type':
-                code = ErrorCode.INVALID_DATA_TYPE
-            elif error_type == 'value_error':
-                code = ErrorCode.INVALID_FORMAT
-            else:
-                code = ErrorCode.VALIDATION_ERROR
+            code = _PYDANTIC_ERROR_MAP.get(error_type, ErrorCode.VALIDATION_ERROR)
             
             field_errors.append(FieldError(
                 field=field_path,
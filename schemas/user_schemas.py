@@ -1,5 +1,18 @@
-from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional
+import re
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+from typing import Annotated, Optional
+
+# Compiled once at import; the validator below runs on every request body
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+def _check_email(value: str) -> str:
+    """Reject strings that are not shaped like ``local@domain.tld``."""
+    if _EMAIL_RE.match(value) is None:
+        raise ValueError('value is not a valid email address')
+    return value
+
+# max_length is enforced in pydantic-core before the regex sees the value
+EmailAddress = Annotated[str, Field(max_length=100), AfterValidator(_check_email)]
 
 class UserCreateSchema(BaseModel):
     """Schema for creating a new user.
@@ -9,12 +22,12 @@ class UserCreateSchema(BaseModel):
     
     Attributes:
         username (str): The username for the new user. Must be 3-50 characters.
-        email (str): The email address for the new user. Must be up to 100 characters.
+        email (str): The email address for the new user. Must look like an email and be up to 100 characters.
         age (int): The age of the user.
         role (str): The role of the user in the system. Must be up to 20 characters.
     """
     username: str = Field(min_length=3, max_length=50)
-    email: str = Field(max_length=100)
+    email: EmailAddress
     age: int
     role: str = Field(max_length=20)
 
@@ -26,12 +39,12 @@ class UserUpdateSchema(BaseModel):
     
     Attributes:
         username (Optional[str]): The username for the user. Must be 3-50 characters if provided.
-        email (Optional[str]): The email address for the user. Must be up to 100 characters if provided.
+        email (Optional[str]): The email address for the user. Must look like an email and be up to 100 characters if provided.
         age (Optional[int]): The age of the user if provided.
         role (Optional[str]): The role of the user in the system. Must be up to 20 characters if provided.
     """
     username: Optional[str] = Field(None, min_length=3, max_length=50)
-    email: Optional[str] = Field(None, max_length=100)
+    email: Optional[EmailAddress] = None
     age: Optional[int] = None
     role: Optional[str] = Field(None, max_length=20)
 
@@ -54,7 +67,8 @@ class UserSchema(BaseModel):
     age: int
     role: str
     
-    model_config = ConfigDict(from_attributes=True)  # Allows conversion from SQLAlchemy models
+    # Reads SQLAlchemy models directly; response objects are never mutated
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 class UserResponseSchema(BaseModel):
     """Schema for API responses containing multiple users.
@@ -2,62 +2,118 @@ from models import db
 from models.user import User
 from sqlalchemy.exc import IntegrityError, DatabaseError
 from schemas.error_schemas import ErrorResponse, ErrorResponseBuilder
-from typing import Tuple, Optional, Dict, Any
-from functools import wraps
-import inspect
+from sqlalchemy import bindparam, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import raiseload
+from typing import Iterator, Tuple, Optional, Dict, Any
 
 
-def handle_database_errors(operation_name: str):
-    """Decorator to handle common database errors in service methods.
+def _write_error(exc, operation_name: str, username=None, email=None) -> ErrorResponse:
+    """Roll back a failed write and describe it as an ErrorResponse.
     
     Args:
+        exc (Exception): The exception raised while writing.
         operation_name (str): Name of the operation for error messages.
+        username (str, optional): Username the write tried to store, if any.
+        email (str, optional): Email the write tried to store, if any.
         
     Returns:
-        Decorator function that handles database errors.
+        ErrorResponse: The error to hand back to the route.
     """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            try:
-                return func(*args, **kwargs)
-            except IntegrityError as e:
-                db.session.rollback()
-                # Handle specific database constraints
-                error_msg = str(e.orig)
-                
-                # Get function signature to extract username/email from args
-                sig = inspect.signature(func)
-                bound_args = sig.bind(*args, **kwargs)
-                bound_args.apply_defaults()
-                
-                if "username" in error_msg.lower():
-                    username = bound_args.arguments.get('username') or (
-                        bound_args.arguments.get('update_data', {}).get('username') if 'update_data' in bound_args.arguments else None
-                    )
-                    return None, ErrorResponseBuilder.already_exists("User", "username", username) if username else ErrorResponseBuilder.already_exists("User", "username", "unknown")
-                elif "email" in error_msg.lower():
-                    email = bound_args.arguments.get('email') or (
-                        bound_args.arguments.get('update_data', {}).get('email') if 'update_data' in bound_args.arguments else None
-                    )
-                    return None, ErrorResponseBuilder.already_exists("User", "email", email) if email else ErrorResponseBuilder.already_exists("User", "email", "unknown")
-                else:
-                    return None, ErrorResponseBuilder.constraint_violation(
-                        "unknown_constraint", 
-                        "A database constraint was violated"
-                    )
-            except DatabaseError as e:
-                db.session.rollback()
-                return None, ErrorResponseBuilder.database_error(
-                    f"Failed to {operation_name} due to database error"
-                )
-            except Exception as e:
-                db.session.rollback()
-                return None, ErrorResponseBuilder.internal_server_error(
-                    f"An unexpected error occurred while {operation_name}"
-                )
-        return wrapper
-    return decorator
+    db.session.rollback()
+    
+    # IntegrityError subclasses DatabaseError, so check it first
+    if isinstance(exc, IntegrityError):
+        # Handle specific database constraints
+        error_msg = str(exc.orig).lower()
+        if "username" in error_msg:
+            return ErrorResponseBuilder.already_exists("User", "username", username or "unknown")
+        if "email" in error_msg:
+            return ErrorResponseBuilder.already_exists("User", "email", email or "unknown")
+        return ErrorResponseBuilder.constraint_violation(
+            "unknown_constraint", 
+            "A database constraint was violated"
+        )
+    if isinstance(exc, DatabaseError):
+        return ErrorResponseBuilder.database_error(
+            f"Failed to {operation_name} due to database error"
+        )
+    return ErrorResponseBuilder.internal_server_error(
+        f"An unexpected error occurred while {operation_name}"
+    )
+
+
+def _create_conflict(username: str, email: str) -> ErrorResponse:
+    """Describe which unique column made an ON CONFLICT DO NOTHING insert skip.
+    
+    The conflicting row is looked up again after the insert, so it may have
+    been deleted in between; if neither column matches any more, the
+    generic constraint error is returned rather than guessing a field.
+    
+    Args:
+        username (str): Username the insert tried to store.
+        email (str): Email the insert tried to store.
+        
+    Returns:
+        ErrorResponse: An already-exists error naming the conflicting field,
+        or a constraint violation if no conflicting row is found.
+    """
+    taken = db.session.execute(
+        select(User.username).where(or_(User.username == username, User.email == email)).limit(1)
+    ).first()
+    if taken is None:
+        return ErrorResponseBuilder.constraint_violation(
+            "unknown_constraint",
+            "A database constraint was violated"
+        )
+    if taken.username == username:
+        return ErrorResponseBuilder.already_exists("User", "username", username)
+    return ErrorResponseBuilder.already_exists("User", "email", email)
+
+
+# Primary-key lookup built once; each request starts with an empty identity
+# map, so this skips Session.get's identity-key and loader setup per call
+_GET_USER_STMT = select(User).where(User.id == bindparam('id'))
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING ... RETURNING; other
+# backends fall back to a plain INSERT and catch the IntegrityError
+_CONFLICT_FREE_INSERTS = {
+    'postgresql': pg_insert,
+    'sqlite': sqlite_insert,
+}
+
+# Columns update_user may change; anything else in update_data is ignored
+_USER_UPDATABLE_FIELDS = frozenset(('username', 'email', 'age', 'role'))
+
+
+def _scalar_batches(statement, batch_size):
+    """Run *statement* with a ``yield_per`` cursor and yield its rows in batches.
+    
+    Relationship loads are set to raise, so a serializer that touches one
+    fails loudly instead of issuing a query per row; a listing that needs a
+    relationship must eager-load it (e.g. ``selectinload``) explicitly.
+    
+    A database error from the initial query yields nothing, so a listing
+    that cannot start is served empty. Errors while fetching later batches
+    propagate: part of a listing has already been consumed by then, and
+    swallowing the error would pass a truncated listing off as complete.
+    
+    Args:
+        statement: The ``select()`` to execute.
+        batch_size (int): Number of rows fetched per round-trip.
+        
+    Yields:
+        list: The next batch of ORM objects.
+    """
+    try:
+        result = db.session.scalars(
+            statement.options(raiseload('*')).execution_options(yield_per=batch_size)
+        )
+    except DatabaseError:
+        # The query never ran, so no rows have been handed out yet
+        return
+    yield from result.partitions()
 
 
 class UserService:
@@ -68,7 +124,6 @@ class UserService:
     """
     
     @staticmethod
-    @handle_database_errors("creating user")
     def create_user(
         username: str,
         email: str,
@@ -86,18 +141,37 @@ class UserService:
         Returns:
             tuple: A tuple containing (User, None) on success or (None, ErrorResponse) on failure.
         """
-        user = User(
-            username=username,
-            email=email,
-            age=age,
-            role=role,
-        )
-        db.session.add(user)
-        db.session.commit()
+        insert = _CONFLICT_FREE_INSERTS.get(db.session.get_bind().dialect.name)
+        try:
+            if insert is None:
+                user = User(
+                    username=username,
+                    email=email,
+                    age=age,
+                    role=role,
+                )
+                db.session.add(user)
+                db.session.commit()
+                return user, None
+            
+            # A single INSERT both writes the row and reports a duplicate
+            # username or email (as an empty RETURNING). The returned row is
+            # still expired by commit() under the default expire_on_commit,
+            # so serializing it afterwards reloads it with one SELECT.
+            user = db.session.scalars(
+                insert(User)
+                .values(username=username, email=email, age=age, role=role)
+                .on_conflict_do_nothing()
+                .returning(User)
+            ).one_or_none()
+            db.session.commit()
+            if user is None:
+                return None, _create_conflict(username, email)
+        except Exception as e:
+            return None, _write_error(e, "creating user", username, email)
         return user, None
     
     @staticmethod
-    @handle_database_errors("updating user")
     def update_user(
         id: int,
         update_data: Dict[str, Any]
@@ -111,17 +185,22 @@ class UserService:
         Returns:
             tuple: A tuple containing (User, None) on success or (None, ErrorResponse) on failure.
         """
-        # Get the user to update
-        user = db.session.get(User, id)
-        if not user:
-            return None, ErrorResponseBuilder.not_found("User", id)
-        
-        # Update the user's fields
-        for field, value in update_data.items():
-            if hasattr(user, field):
-                setattr(user, field, value)
-        
-        db.session.commit()
+        try:
+            # Get the user to update
+            user = db.session.get(User, id)
+            if not user:
+                return None, ErrorResponseBuilder.not_found("User", id)
+            
+            # Update the user's fields
+            for field, value in update_data.items():
+                if field in _USER_UPDATABLE_FIELDS:
+                    setattr(user, field, value)
+            
+            db.session.commit()
+        except Exception as e:
+            return None, _write_error(
+                e, "updating user", update_data.get('username'), update_data.get('email')
+            )
         return user, None
         
     @staticmethod
@@ -135,40 +214,45 @@ class UserService:
             User or None: The User object if found, None otherwise.
         """
         try:
-            return db.session.get(User, id)
+            return db.session.execute(_GET_USER_STMT, {'id': id}).scalar_one_or_none()
         except DatabaseError:
             # For read operations, we don't need to return error responses
             # as the route handler will check for None and return appropriate error
             return None
     
     @staticmethod
-    def get_all_users() -> list[User]:
-        """Get all users from the database.
+    def iter_all_users(batch_size: int = 500) -> Iterator[list[User]]:
+        """Yield all users from the database in batches.
         
-        Returns:
-            list[User]: A list of all User objects in the database.
+        Rows are fetched ``batch_size`` at a time, so callers hold at most one
+        batch of User objects in memory instead of the whole table.
+        
+        Args:
+            batch_size (int): Number of users fetched per round-trip. Defaults to 500.
+            
+        Yields:
+            list[User]: The next batch of User objects.
+            
+        Raises:
+            DatabaseError: If a batch fails to load once the query has started.
         """
-        try:
-            return db.session.query(User).all()
-        except DatabaseError:
-            # Return empty list if database error occurs
-            return []
+        yield from _scalar_batches(select(User), batch_size)
         
     @staticmethod
-    def get_users_by_role(role: str) -> list[User]:
-        """Get all users with a specific role.
+    def iter_users_by_role(role: str, batch_size: int = 500) -> Iterator[list[User]]:
+        """Yield users with a specific role in batches.
         
         Args:
             role (str): The role to filter users by.
+            batch_size (int): Number of users fetched per round-trip. Defaults to 500.
             
-        Returns:
-            list[User]: A list of User objects with the specified role.
+        Yields:
+            list[User]: The next batch of matching User objects.
+            
+        Raises:
+            DatabaseError: If a batch fails to load once the query has started.
         """
-        try:
-            return db.session.query(User).filter(User.role == role).all()
-        except DatabaseError:
-            # Return empty list if database error occurs
-            return []
+        yield from _scalar_batches(select(User).where(User.role == role), batch_size)
 
     @staticmethod
     def delete_user(id: int) -> Tuple[bool, Optional[ErrorResponse]]:
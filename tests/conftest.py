@@ -1,21 +1,45 @@
+import contextlib
 import pytest
+
+# Shared assertion helpers live in tests.fixtures; rewrite them like test code
+pytest.register_assert_rewrite('tests.fixtures')
+
 from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.orm import scoped_session, sessionmaker
 from models import db
-from routes import register_blueprints
-from config import config
+from routes import register_blueprints, register_error_handlers
+from config import get_config
+from json_provider import PydanticJSONProvider
 
 
-@pytest.fixture
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    """Stop pysqlite from issuing its own BEGIN/COMMIT statements."""
+    dbapi_connection.isolation_level = None
+
+
+def _emit_begin(connection):
+    """Start every SQLAlchemy transaction with an explicit BEGIN."""
+    connection.exec_driver_sql('BEGIN')
+
+
+@pytest.fixture(scope='session')
 def app():
-    """Create and configure a test Flask application."""
+    """Create and configure the test Flask application.
+    
+    The app and its schema are built once per test session; ``db_session``
+    rolls back whatever each test writes.
+    """
     app = Flask(__name__)
-    app.config.from_object(config['testing']())
+    app.json = PydanticJSONProvider(app)
+    app.config.from_object(get_config('testing'))
     
     # Initialize database
     db.init_app(app)
     
     # Register blueprints
     register_blueprints(app)
+    register_error_handlers(app)
     
     # Add health check endpoint
     @app.route('/health')
@@ -23,13 +47,87 @@ def app():
         return 'healthy, thank you!'
     
     with app.app_context():
+        # pysqlite defers BEGIN and ignores SAVEPOINT nesting on its own; let
+        # SQLAlchemy emit BEGIN itself so db_session can roll tests back
+        event.listen(db.engine, 'connect', _disable_pysqlite_transactions)
+        event.listen(db.engine, 'begin', _emit_begin)
         db.create_all()
-        yield app
+    
+    yield app
+    
+    with app.app_context():
         db.drop_all()
 
 
 @pytest.fixture
-def client(app):
+def db_session(app):
+    """Run the test inside a database transaction that is rolled back afterwards.
+    
+    ``db.session`` is bound to one connection holding an outer transaction.
+    Commits made by the app or fixtures only release SAVEPOINTs, so nothing a
+    test writes is visible to the next one.
+    """
+    with app.app_context():
+        connection = db.engine.connect()
+        transaction = connection.begin()
+        app_session = db.session
+        # Nothing outside this connection can change rows mid-test, so skip
+        # expiring instances on commit and reloading them on next access
+        db.session = scoped_session(sessionmaker(
+            bind=connection,
+            join_transaction_mode='create_savepoint',
+            expire_on_commit=False
+        ))
+        try:
+            yield db.session
+        finally:
+            db.session.remove()
+            db.session = app_session
+            transaction.rollback()
+            connection.close()
+
+
+@pytest.fixture
+def count_queries(db_session):
+    """Return a context manager that records the SQL run on the test connection.
+    
+    Transaction-control statements issued by the ``db_session`` savepoints are
+    left out, so the recorded list holds only the queries the code under test
+    asked for. Inside the block the session expires instances on commit, as
+    the app's production session does, so a budget also counts the reloads
+    that ``expire_on_commit=True`` causes::
+    
+        with count_queries() as queries:
+            client.get('/api/users')
+        assert len(queries) == 1
+    """
+    connection = db_session.connection()
+    
+    @contextlib.contextmanager
+    def _count_queries():
+        queries = []
+        
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            if not statement.startswith(('BEGIN', 'SAVEPOINT', 'RELEASE', 'ROLLBACK')):
+                queries.append(statement)
+        
+        # Sessions made during the block (one per request) and the current
+        # one both follow the production setting
+        db_session.session_factory.configure(expire_on_commit=True)
+        db_session().expire_on_commit = True
+        event.listen(connection, 'before_cursor_execute', _record)
+        try:
+            yield queries
+        finally:
+            event.remove(connection, 'before_cursor_execute', _record)
+            db_session.session_factory.configure(expire_on_commit=False)
+            db_session().expire_on_commit = False
+    
+    return _count_queries
+
+
+@pytest.fixture
+def client(app, db_session):
     """Create a test client for the Flask application."""
     return app.test_client()
 
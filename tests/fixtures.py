@@ -1,7 +1,11 @@
 import pytest
+from sqlalchemy import insert
 from models.user import User
 from models import db
 
+# One multi-row INSERT ... RETURNING, built once and shared by both creators
+_INSERT_USERS = insert(User).returning(User, sort_by_parameter_order=True)
+
 
 @pytest.fixture
 def sample_user_data():
@@ -40,15 +44,15 @@ def sample_users_data():
 
 
 @pytest.fixture
-def create_user(app):
+def create_user(app, db_session):
     """Create a single user in the database for testing."""
     def _create_user(username='testuser', email='test@example.com', age=25, role='admin'):
         with app.app_context():
-            user = User(username=username, email=email, age=age, role=role)
-            db.session.add(user)
+            user = db.session.scalars(
+                _INSERT_USERS,
+                [{'username': username, 'email': email, 'age': age, 'role': role}]
+            ).one()
             db.session.commit()
-            # Refresh the user to get the ID and avoid detached session issues
-            db.session.refresh(user)
             # Return the user data as a dict to avoid session issues
             return {
                 'id': user.id,
@@ -61,15 +65,27 @@ def create_user(app):
 
 
 @pytest.fixture
-def create_users(app):
+def create_users(app, db_session):
     """Create multiple users in the database for testing."""
     def _create_users(users_data):
         with app.app_context():
-            created_users = []
-            for user_data in users_data:
-                user = User(**user_data)
-                db.session.add(user)
-                created_users.append(user)
+            # One statement for every row instead of a unit-of-work flush per user
+            created_users = db.session.scalars(_INSERT_USERS, users_data).all()
             db.session.commit()
             return created_users
-    return _create_users
\ No newline at end of file
+    return _create_users
+
+
+def assert_error(data, error, code, message_contains=None):
+    """Assert that *data* is an error envelope with the given error and code.
+    
+    Args:
+        data (dict): The decoded response body.
+        error (str): Expected ``error`` title.
+        code (str): Expected ``code`` value.
+        message_contains (str, optional): Text the ``message`` must include.
+    """
+    assert 'message' in data
+    assert {'error': error, 'code': code}.items() <= data.items()
+    if message_contains is not None:
+        assert message_contains in data['message']
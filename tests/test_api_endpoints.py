@@ -1,6 +1,25 @@
 import pytest
 import json
-from tests.fixtures import sample_user_data, sample_users_data, create_user, create_users
+from operator import itemgetter
+from sqlalchemy.engine import ScalarResult
+from sqlalchemy.exc import DatabaseError
+from services.user_service import UserService
+from schemas.user_schemas import UserResponseSchema
+from tests.fixtures import sample_user_data, sample_users_data, create_user, create_users, assert_error
+
+# Boundary values for the schema's length limits, built once for the module
+MAX_USERNAME = 'a' * 50  # Maximum length
+LONG_USERNAME = 'a' * 51  # Too long
+MAX_EMAIL = 'a' * 90 + '@email.com'  # Maximum length (100 chars)
+LONG_EMAIL = 'a' * 91 + '@email.com'  # Too long (101 chars)
+MAX_ROLE = 'a' * 20  # Maximum length
+LONG_ROLE = 'a' * 21  # Too long
+
+# Pydantic's messages for the limits above
+USERNAME_TOO_SHORT = 'String should have at least 3 characters'
+USERNAME_TOO_LONG = 'String should have at most 50 characters'
+EMAIL_TOO_LONG = 'String should have at most 100 characters'
+ROLE_TOO_LONG = 'String should have at most 20 characters'
 
 
 class TestHealthEndpoint:
@@ -10,7 +29,7 @@ class TestHealthEndpoint:
         """Test the health check endpoint returns the correct response."""
         response = client.get('/health')
         assert response.status_code == 200
-        assert response.get_data(as_text=True) == 'healthy, thank you!'
+        assert response.get_data() == b'healthy, thank you!'
 
 
 class TestGetAllUsers:
@@ -27,22 +46,83 @@ class TestGetAllUsers:
     
     def test_get_all_users_with_data(self, client, sample_users_data, create_users):
         """Test getting all users when database has data."""
-        create_users(sample_users_data)
+        created = create_users(sample_users_data)
+        expected = [{'id': user.id, **row} for user, row in zip(created, sample_users_data)]
         
         response = client.get('/api/users')
         assert response.status_code == 200
         
         data = response.get_json()
-        assert 'users' in data
-        assert len(data['users']) == 3
-        
-        # Check that each user has the required fields
-        for user in data['users']:
-            assert 'id' in user
-            assert 'username' in user
-            assert 'email' in user
-            assert 'age' in user
-            assert 'role' in user
+        assert sorted(data['users'], key=itemgetter('id')) == expected
+    
+    def test_get_all_users_across_batches(self, client, sample_users_data, create_users, monkeypatch):
+        """Test the listing is identical when users are read in several batches."""
+        create_users(sample_users_data)
+        expected = client.get('/api/users').get_data()
+        
+        iter_all_users = UserService.iter_all_users
+        monkeypatch.setattr(UserService, 'iter_all_users', lambda: iter_all_users(batch_size=2))
+        
+        response = client.get('/api/users')
+        assert response.status_code == 200
+        assert response.get_data() == expected
+        assert [user['username'] for user in response.get_json()['users']] == ['alice', 'bob', 'charlie']
+    
+    def test_get_all_users_single_query(self, client, sample_users_data, create_users, count_queries, monkeypatch):
+        """Test the listing reads every batch from one query."""
+        create_users(sample_users_data)
+        iter_all_users = UserService.iter_all_users
+        monkeypatch.setattr(UserService, 'iter_all_users', lambda: iter_all_users(batch_size=2))
+        
+        with count_queries() as queries:
+            response = client.get('/api/users')
+        
+        assert response.status_code == 200
+        assert len(queries) == 1
+    
+    def test_get_all_users_database_error_mid_listing(self, client, sample_users_data, create_users, monkeypatch):
+        """Test a database error after the first batch returns a 500, not a truncated listing."""
+        create_users(sample_users_data)
+        partitions = ScalarResult.partitions
+        
+        def failing_partitions(result, size=None):
+            yield next(partitions(result, size))
+            raise DatabaseError("statement", "params", "orig")
+        monkeypatch.setattr(ScalarResult, 'partitions', failing_partitions)
+        
+        response = client.get('/api/users')
+        assert response.status_code == 500
+        assert 'ETag' not in response.headers
+        assert_error(response.get_json(), 'Internal Server Error', 'INTERNAL_SERVER_ERROR')
+    
+    def test_get_all_users_sets_etag(self, client, sample_users_data, create_users):
+        """Test getting all users returns an ETag header."""
+        create_users(sample_users_data)
+        
+        response = client.get('/api/users')
+        assert response.status_code == 200
+        assert response.headers.get('ETag')
+    
+    def test_get_all_users_not_modified(self, client, sample_users_data, create_users):
+        """Test getting all users with a matching If-None-Match returns 304."""
+        create_users(sample_users_data)
+        
+        etag = client.get('/api/users').headers['ETag']
+        
+        response = client.get('/api/users', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.get_data() == b''
+    
+    def test_get_all_users_etag_changes_after_create(self, client, sample_user_data):
+        """Test the ETag changes once the user list changes."""
+        etag = client.get('/api/users').headers['ETag']
+        
+        client.post('/api/users', json=sample_user_data)
+        
+        response = client.get('/api/users', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert len(response.get_json()['users']) == 1
 
 
 class TestGetUsersByRole:
@@ -70,6 +150,44 @@ class TestGetUsersByRole:
         assert data['users'][0]['role'] == 'admin'
         assert data['users'][0]['username'] == 'alice'
     
+    def test_get_users_by_role_matches_response_schema(self, client, sample_users_data, create_users):
+        """Test the listing body is exactly what UserResponseSchema would serialize."""
+        created = create_users(sample_users_data)
+        
+        response = client.get('/api/users/role/admin')
+        assert response.status_code == 200
+        
+        expected = UserResponseSchema(users=[u for u in created if u.role == 'admin'])
+        assert response.get_data() == expected.model_dump_json().encode()
+    
+    def test_get_users_by_role_single_query(self, client, sample_users_data, create_users, count_queries):
+        """Test the role listing is served by one query."""
+        create_users(sample_users_data)
+        
+        with count_queries() as queries:
+            response = client.get('/api/users/role/user')
+        
+        assert response.status_code == 200
+        assert len(queries) == 1
+    
+    def test_get_users_by_role_database_error_mid_listing(self, client, create_users, monkeypatch):
+        """Test a database error after the first batch returns a 500, not a truncated listing."""
+        create_users([
+            {'username': 'admin1', 'email': 'admin1@example.com', 'age': 30, 'role': 'admin'},
+            {'username': 'admin2', 'email': 'admin2@example.com', 'age': 31, 'role': 'admin'},
+        ])
+        partitions = ScalarResult.partitions
+        
+        def failing_partitions(result, size=None):
+            yield next(partitions(result, size))
+            raise DatabaseError("statement", "params", "orig")
+        monkeypatch.setattr(ScalarResult, 'partitions', failing_partitions)
+        
+        response = client.get('/api/users/role/admin')
+        assert response.status_code == 500
+        assert 'ETag' not in response.headers
+        assert_error(response.get_json(), 'Internal Server Error', 'INTERNAL_SERVER_ERROR')
+    
     def test_get_users_by_role_no_matches(self, client, sample_users_data, create_users):
         """Test getting users by role when no users match."""
         create_users(sample_users_data)
@@ -80,6 +198,15 @@ class TestGetUsersByRole:
         data = response.get_json()
         assert 'users' in data
         assert data['users'] == []
+    
+    def test_get_users_by_role_not_modified(self, client, sample_users_data, create_users):
+        """Test getting users by role with a matching If-None-Match returns 304."""
+        create_users(sample_users_data)
+        
+        etag = client.get('/api/users/role/admin').headers['ETag']
+        
+        response = client.get('/api/users/role/admin', headers={'If-None-Match': etag})
+        assert response.status_code == 304
 
 
 class TestGetUserById:
@@ -99,18 +226,30 @@ class TestGetUserById:
         assert data['age'] == 30
         assert data['role'] == 'admin'
     
+    def test_get_user_by_id_single_query(self, client, create_user, count_queries):
+        """Test a user lookup is served by one query."""
+        user = create_user(username='testuser', email='test@example.com', age=30, role='admin')
+        
+        with count_queries() as queries:
+            response = client.get(f'/api/users/{user["id"]}')
+        
+        assert response.status_code == 200
+        assert len(queries) == 1
+    
     def test_get_user_by_id_not_found(self, client):
         """Test getting a user by ID when user doesn't exist."""
         response = client.get('/api/users/999')
         assert response.status_code == 404
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Resource Not Found'
-        assert data['code'] == 'RESOURCE_NOT_FOUND'
-        assert 'User not found with id: 999' in data['message']
+        assert_error(data, 'Resource Not Found', 'RESOURCE_NOT_FOUND', 'User not found with id: 999')
+    
+    def test_get_user_not_found_repeated_ids(self, client):
+        """Test repeated misses keep reporting the requested ID."""
+        for user_id in (998, 999, 998):
+            response = client.get(f'/api/users/{user_id}')
+            assert response.status_code == 404
+            assert f'User not found with id: {user_id}' in response.get_json()['message']
 
 
 class TestDeleteUser:
@@ -130,12 +269,7 @@ class TestDeleteUser:
         assert response.status_code == 404
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Resource Not Found'
-        assert data['code'] == 'RESOURCE_NOT_FOUND'
-        assert 'User not found with id: 999' in data['message']
+        assert_error(data, 'Resource Not Found', 'RESOURCE_NOT_FOUND', 'User not found with id: 999')
     
     def test_delete_user_removes_from_database(self, client, create_user):
         """Test that deleted user is completely removed from database."""
@@ -155,12 +289,7 @@ class TestDeleteUser:
         assert response.status_code == 404
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Resource Not Found'
-        assert data['code'] == 'RESOURCE_NOT_FOUND'
-        assert f'User not found with id: {user_id}' in data['message']
+        assert_error(data, 'Resource Not Found', 'RESOURCE_NOT_FOUND', f'User not found with id: {user_id}')
     
     def test_delete_user_not_in_all_users_list(self, client, create_user):
         """Test that deleted user is not included in get all users response."""
@@ -171,9 +300,7 @@ class TestDeleteUser:
         response = client.get('/api/users')
         assert response.status_code == 200
         data = response.get_json()
-        user_ids = [u['id'] for u in data['users']]
-        assert user_id in user_ids
-        assert len(data['users']) == 1
+        assert [u['id'] for u in data['users']] == [user_id]
         
         # Delete the user
         response = client.delete(f'/api/users/{user_id}')
@@ -183,9 +310,7 @@ class TestDeleteUser:
         response = client.get('/api/users')
         assert response.status_code == 200
         data = response.get_json()
-        user_ids = [u['id'] for u in data['users']]
-        assert user_id not in user_ids
-        assert len(data['users']) == 0
+        assert data['users'] == []
     
     def test_delete_user_multiple_users(self, client, create_users, sample_users_data):
         """Test deleting one user doesn't affect other users."""
@@ -213,8 +338,7 @@ class TestDeleteUser:
         assert remaining_count == initial_count - 1
         
         # Verify the deleted user is not in the list
-        remaining_user_ids = [u['id'] for u in data['users']]
-        assert user_id_to_delete not in remaining_user_ids
+        assert user_id_to_delete not in {u['id'] for u in data['users']}
 
 
 class TestCreateUser:
@@ -252,12 +376,7 @@ class TestCreateUser:
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'Field required' in data['message']
+        assert_error(data, 'Validation Error', 'VALIDATION_ERROR', 'Field required')
     
     def test_create_user_invalid_data_types(self, client):
         """Test creating a user with invalid data types returns 400 Bad Request."""
@@ -272,12 +391,7 @@ class TestCreateUser:
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'Input should be a valid integer' in data['message']
+        assert_error(data, 'Validation Error', 'VALIDATION_ERROR', 'Input should be a valid integer')
     
     def test_create_user_no_json_body(self, client):
         """Test creating a user without JSON body returns 400 Bad Request."""
@@ -285,136 +399,69 @@ class TestCreateUser:
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Invalid JSON'
-        assert data['code'] == 'INVALID_JSON'
-        assert 'Request must have JSON content type' in data['message']
+        assert_error(data, 'Invalid JSON', 'INVALID_JSON', 'Request must have JSON content type')
     
-    def test_create_user_empty_json(self, client):
-        """Test creating a user with empty JSON body returns 400 Bad Request."""
-        empty_json = {}
-        
-        response = client.post('/api/users', json=empty_json)
+    def test_create_user_json_array(self, client):
+        """Test creating a user with a non-object JSON body returns 400 Bad Request."""
+        response = client.post('/api/users', json=[{'username': 'testuser'}])
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
         assert data['code'] == 'VALIDATION_ERROR'
-        assert 'Field required' in data['message']
     
-    def test_create_user_username_empty(self, client):
-        """Test creating a user with empty username returns 400 Bad Request."""
-        invalid_data = {
-            'username': '',
-            'email': 'test@example.com',
-            'age': 30,
-            'role': 'admin'
-        }
+    def test_create_user_unexpected_error(self, client, sample_user_data, monkeypatch):
+        """Test an unexpected error while creating a user returns the JSON 500 envelope."""
+        def explode(*args):
+            raise RuntimeError('boom')
+        monkeypatch.setattr(UserService, 'create_user', explode)
         
-        response = client.post('/api/users', json=invalid_data)
-        assert response.status_code == 400
-        
-        data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'String should have at least 3 characters' in data['message']
-    
-    def test_create_user_username_too_short(self, client):
-        """Test creating a user with username too short returns 400 Bad Request."""
-        invalid_data = {
-            'username': 'ab',  # Too short
-            'email': 'test@example.com',
-            'age': 30,
-            'role': 'admin'
+        response = client.post('/api/users', json=sample_user_data)
+        assert response.status_code == 500
+        assert response.mimetype == 'application/json'
+        
+        # The app-wide 500 handler's generic body, not a route-specific message
+        assert response.get_json() == {
+            'error': 'Internal Server Error',
+            'code': 'INTERNAL_SERVER_ERROR',
+            'message': 'An internal server error occurred',
+            'details': None,
+            'request_id': None
         }
-        
-        response = client.post('/api/users', json=invalid_data)
-        assert response.status_code == 400
-        
-        data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'String should have at least 3 characters' in data['message']
     
-    def test_create_user_username_minimum_length(self, client):
-        """Test creating a user with username at minimum length succeeds."""
-        valid_data = {
-            'username': 'abc',  # Minimum length
-            'email': 'test@example.com',
-            'age': 30,
-            'role': 'admin'
-        }
-        
-        response = client.post('/api/users', json=valid_data)
-        assert response.status_code == 201
-        
-        data = response.get_json()
-        assert 'id' in data
-        assert data['username'] == 'abc'
-        assert data['email'] == 'test@example.com'
-        assert data['age'] == 30
-        assert data['role'] == 'admin'
+    def test_create_user_malformed_json(self, client):
+        """Test creating a user with a malformed JSON body returns 400 Bad Request."""
+        for body in ('{"username": "testuser",', '', 'null'):
+            response = client.post('/api/users', data=body, content_type='application/json')
+            assert response.status_code == 400
+            
+            data = response.get_json()
+            assert data['code'] == 'INVALID_JSON'
+            assert 'Request body must be valid JSON' in data['message']
     
-    def test_create_user_username_maximum_length(self, client):
-        """Test creating a user with username at maximum length succeeds."""
-        max_username = 'a' * 50  # Maximum length
-        valid_data = {
-            'username': max_username,
-            'email': 'test@example.com',
-            'age': 30,
-            'role': 'admin'
-        }
-        
-        response = client.post('/api/users', json=valid_data)
-        assert response.status_code == 201
-        
-        data = response.get_json()
-        assert 'id' in data
-        assert data['username'] == max_username
-        assert data['email'] == 'test@example.com'
-        assert data['age'] == 30
-        assert data['role'] == 'admin'
-    
-    def test_create_user_username_too_long(self, client):
-        """Test creating a user with username too long returns 400 Bad Request."""
-        long_username = 'a' * 51  # Too long
-        invalid_data = {
-            'username': long_username,
-            'email': 'test@example.com',
-            'age': 30,
-            'role': 'admin'
-        }
+    def test_create_user_empty_json(self, client):
+        """Test creating a user with empty JSON body returns 400 Bad Request."""
+        empty_json = {}
         
-        response = client.post('/api/users', json=invalid_data)
+        response = client.post('/api/users', json=empty_json)
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'String should have at most 50 characters' in data['message']
+        assert_error(data, 'Validation Error', 'VALIDATION_ERROR', 'Field required')
     
-    def test_create_user_email_maximum_length(self, client):
-        """Test creating a user with email at maximum length succeeds."""
-        max_email = 'a' * 90 + '@email.com'  # Maximum length (100 chars)
+    @pytest.mark.parametrize('field, value', [
+        ('username', 'abc'),
+        ('username', MAX_USERNAME),
+        ('email', MAX_EMAIL),
+        ('role', MAX_ROLE),
+    ], ids=['username-min', 'username-max', 'email-max', 'role-max'])
+    def test_create_user_boundary_lengths(self, client, field, value):
+        """Test creating a user with a field at its length limit succeeds."""
         valid_data = {
             'username': 'testuser',
-            'email': max_email,
+            'email': 'test@example.com',
             'age': 30,
-            'role': 'admin'
+            'role': 'admin',
+            field: value
         }
         
         response = client.post('/api/users', json=valid_data)
@@ -422,72 +469,40 @@ class TestCreateUser:
         
         data = response.get_json()
         assert 'id' in data
-        assert data['username'] == 'testuser'
-        assert data['email'] == max_email
-        assert data['age'] == 30
-        assert data['role'] == 'admin'
-    
-    def test_create_user_email_too_long(self, client):
-        """Test creating a user with email too long returns 400 Bad Request."""
-        long_email = 'a' * 91 + '@email.com'  # Too long (101 chars)
+        assert {key: data[key] for key in valid_data} == valid_data
+    
+    @pytest.mark.parametrize('field, value, expected_message', [
+        ('username', '', USERNAME_TOO_SHORT),
+        ('username', 'ab', USERNAME_TOO_SHORT),
+        ('username', LONG_USERNAME, USERNAME_TOO_LONG),
+        ('email', LONG_EMAIL, EMAIL_TOO_LONG),
+        ('role', LONG_ROLE, ROLE_TOO_LONG),
+    ], ids=['username-empty', 'username-short', 'username-long', 'email-long', 'role-long'])
+    def test_create_user_field_validation(self, client, field, value, expected_message):
+        """Test creating a user with an out-of-range field returns 400 Bad Request."""
         invalid_data = {
             'username': 'testuser',
-            'email': long_email,
+            'email': 'test@example.com',
             'age': 30,
-            'role': 'admin'
+            'role': 'admin',
+            field: value
         }
         
         response = client.post('/api/users', json=invalid_data)
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'String should have at most 100 characters' in data['message']
+        assert_error(data, 'Validation Error', 'VALIDATION_ERROR', expected_message)
     
-    def test_create_user_role_maximum_length(self, client):
-        """Test creating a user with role at maximum length succeeds."""
-        max_role = 'a' * 20  # Maximum length
-        valid_data = {
-            'username': 'testuser',
-            'email': 'test@example.com',
-            'age': 30,
-            'role': max_role
-        }
+    def test_create_user_insert_then_reload(self, client, sample_user_data, count_queries):
+        """Test a new user is stored by one INSERT and reloaded once after commit expires it."""
+        with count_queries() as queries:
+            response = client.post('/api/users', json=sample_user_data)
         
-        response = client.post('/api/users', json=valid_data)
         assert response.status_code == 201
-        
-        data = response.get_json()
-        assert 'id' in data
-        assert data['username'] == 'testuser'
-        assert data['email'] == 'test@example.com'
-        assert data['age'] == 30
-        assert data['role'] == max_role
-    
-    def test_create_user_role_too_long(self, client):
-        """Test creating a user with role too long returns 400 Bad Request."""
-        long_role = 'a' * 21  # Too long
-        invalid_data = {
-            'username': 'testuser',
-            'email': 'test@example.com',
-            'age': 30,
-            'role': long_role
-        }
-        
-        response = client.post('/api/users', json=invalid_data)
-        assert response.status_code == 400
-        
-        data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'String should have at most 20 characters' in data['message']
+        assert len(queries) == 2
+        assert queries[0].startswith('INSERT')
+        assert queries[1].startswith('SELECT')
 
 
 class TestUpdateUser:
@@ -551,6 +566,25 @@ class TestUpdateUser:
         assert data['age'] == 35
         assert data['role'] == 'admin'  # Unchanged
     
+    def test_update_user_unexpected_error(self, client, create_user, monkeypatch):
+        """Test an unexpected error while updating a user returns the app-wide JSON 500 body."""
+        user = create_user(username='testuser', email='test@example.com', age=30, role='admin')
+        
+        def explode(*args):
+            raise RuntimeError('boom')
+        monkeypatch.setattr(UserService, 'update_user', explode)
+        
+        response = client.patch(f'/api/users/{user["id"]}', json={'age': 31})
+        assert response.status_code == 500
+        assert response.mimetype == 'application/json'
+        assert response.get_json() == {
+            'error': 'Internal Server Error',
+            'code': 'INTERNAL_SERVER_ERROR',
+            'message': 'An internal server error occurred',
+            'details': None,
+            'request_id': None
+        }
+    
     def test_update_user_not_found(self, client):
         """Test updating a user that doesn't exist returns 404 Not Found."""
         update_data = {
@@ -561,12 +595,7 @@ class TestUpdateUser:
         assert response.status_code == 404
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Resource Not Found'
-        assert data['code'] == 'RESOURCE_NOT_FOUND'
-        assert 'User not found with id: 999' in data['message']
+        assert_error(data, 'Resource Not Found', 'RESOURCE_NOT_FOUND', 'User not found with id: 999')
     
     def test_update_user_no_json_body(self, client, create_user):
         """Test updating a user without JSON body returns 400 Bad Request."""
@@ -576,12 +605,7 @@ class TestUpdateUser:
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Invalid JSON'
-        assert data['code'] == 'INVALID_JSON'
-        assert 'Request must have JSON content type' in data['message']
+        assert_error(data, 'Invalid JSON', 'INVALID_JSON', 'Request must have JSON content type')
     
     def test_update_user_empty_json(self, client, create_user):
         """Test updating a user with empty JSON body returns 400 Bad Request."""
@@ -593,107 +617,89 @@ class TestUpdateUser:
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Invalid JSON'
-        assert data['code'] == 'INVALID_JSON'
-        assert 'At least one field must be provided for update' in data['message']
+        assert_error(data, 'Invalid JSON', 'INVALID_JSON', 'At least one field must be provided for update')
     
-    def test_update_user_invalid_data_types(self, client, create_user):
-        """Test updating a user with invalid data types returns 400 Bad Request."""
+    @pytest.mark.parametrize('kwargs, message', [
+        ({}, 'Request must have JSON content type'),
+        ({'data': '{', 'content_type': 'application/json'}, 'Request body must be valid JSON'),
+        ({'json': {}}, 'At least one field must be provided for update'),
+    ], ids=['not-json', 'malformed', 'no-fields'])
+    def test_update_user_invalid_json_exact_body(self, client, create_user, kwargs, message):
+        """Test the pre-serialized 400 bodies are compact JSON with no trailing newline."""
         user = create_user(username='testuser', email='test@example.com', age=30, role='admin')
         
-        invalid_data = {
-            'age': 'not_an_integer'  # Invalid type
-        }
-        
-        response = client.patch(f'/api/users/{user["id"]}', json=invalid_data)
+        response = client.patch(f'/api/users/{user["id"]}', **kwargs)
         assert response.status_code == 400
+        assert response.get_data() == (
+            b'{"error":"Invalid JSON","code":"INVALID_JSON","message":"'
+            + message.encode()
+            + b'","details":null,"request_id":null}'
+        )
+    
+    def test_update_user_null_fields_are_ignored(self, client, create_user):
+        """Test explicit nulls in an update are treated as fields not provided."""
+        user = create_user(username='testuser', email='test@example.com', age=30, role='admin')
+        
+        response = client.patch(f'/api/users/{user["id"]}', json={'age': None, 'role': 'user'})
+        assert response.status_code == 200
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'Input should be a valid integer' in data['message']
+        assert data['age'] == 30
+        assert data['role'] == 'user'
     
-    def test_update_user_username_too_short(self, client, create_user):
-        """Test updating a user with username too short returns 400 Bad Request."""
+    def test_update_user_only_null_fields(self, client, create_user):
+        """Test an update whose fields are all null returns 400 Bad Request."""
         user = create_user(username='testuser', email='test@example.com', age=30, role='admin')
         
-        invalid_data = {
-            'username': 'ab'  # Too short
-        }
-        
-        response = client.patch(f'/api/users/{user["id"]}', json=invalid_data)
+        response = client.patch(f'/api/users/{user["id"]}', json={'username': None, 'age': None})
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'String should have at least 3 characters' in data['message']
+        assert data['code'] == 'INVALID_JSON'
+        assert 'At least one field must be provided for update' in data['message']
     
-    def test_update_user_username_too_long(self, client, create_user):
-        """Test updating a user with username too long returns 400 Bad Request."""
+    def test_update_user_invalid_data_types(self, client, create_user):
+        """Test updating a user with invalid data types returns 400 Bad Request."""
         user = create_user(username='testuser', email='test@example.com', age=30, role='admin')
         
         invalid_data = {
-            'username': 'a' * 51  # Too long
+            'age': 'not_an_integer'  # Invalid type
         }
         
         response = client.patch(f'/api/users/{user["id"]}', json=invalid_data)
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'String should have at most 50 characters' in data['message']
+        assert_error(data, 'Validation Error', 'VALIDATION_ERROR', 'Input should be a valid integer')
     
-    def test_update_user_email_too_long(self, client, create_user):
-        """Test updating a user with email too long returns 400 Bad Request."""
+    @pytest.mark.parametrize('field, value, expected_message', [
+        ('username', 'ab', USERNAME_TOO_SHORT),
+        ('username', LONG_USERNAME, USERNAME_TOO_LONG),
+        ('email', LONG_EMAIL, EMAIL_TOO_LONG),
+        ('role', LONG_ROLE, ROLE_TOO_LONG),
+    ], ids=['username-short', 'username-long', 'email-long', 'role-long'])
+    def test_update_user_field_validation(self, client, create_user, field, value, expected_message):
+        """Test updating a user with an out-of-range field returns 400 Bad Request."""
         user = create_user(username='testuser', email='test@example.com', age=30, role='admin')
         
-        invalid_data = {
-            'email': 'a' * 91 + '@email.com'  # Too long (101 chars)
-        }
-        
-        response = client.patch(f'/api/users/{user["id"]}', json=invalid_data)
+        response = client.patch(f'/api/users/{user["id"]}', json={field: value})
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
-        assert data['code'] == 'VALIDATION_ERROR'
-        assert 'String should have at most 100 characters' in data['message']
+        assert_error(data, 'Validation Error', 'VALIDATION_ERROR', expected_message)
     
-    def test_update_user_role_too_long(self, client, create_user):
-        """Test updating a user with role too long returns 400 Bad Request."""
+    def test_update_user_invalid_email_format(self, client, create_user):
+        """Test updating a user with a malformed email returns 400 Bad Request."""
         user = create_user(username='testuser', email='test@example.com', age=30, role='admin')
         
-        invalid_data = {
-            'role': 'a' * 21  # Too long
-        }
-        
-        response = client.patch(f'/api/users/{user["id"]}', json=invalid_data)
+        response = client.patch(f'/api/users/{user["id"]}', json={'email': 'not-an-email'})
         assert response.status_code == 400
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Validation Error'
         assert data['code'] == 'VALIDATION_ERROR'
-        assert 'String should have at most 20 characters' in data['message']
+        assert data['details'][0]['field'] == 'email'
+        assert data['details'][0]['code'] == 'INVALID_FORMAT'
+        assert 'value is not a valid email address' in data['message']
     
     def test_update_user_username_already_exists(self, client, create_user):
         """Test updating a user with an already existing username returns 409 Conflict."""
@@ -708,12 +714,7 @@ class TestUpdateUser:
         assert response.status_code == 409
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Resource Already Exists'
-        assert data['code'] == 'RESOURCE_ALREADY_EXISTS'
-        assert 'User already exists with username: user1' in data['message']
+        assert_error(data, 'Resource Already Exists', 'RESOURCE_ALREADY_EXISTS', 'User already exists with username: user1')
     
     def test_update_user_email_already_exists(self, client, create_user):
         """Test updating a user with an already existing email returns 409 Conflict."""
@@ -728,13 +729,21 @@ class TestUpdateUser:
         assert response.status_code == 409
         
         data = response.get_json()
-        assert 'error' in data
-        assert 'code' in data
-        assert 'message' in data
-        assert data['error'] == 'Resource Already Exists'
-        assert data['code'] == 'RESOURCE_ALREADY_EXISTS'
-        assert 'User already exists with email: user1@example.com' in data['message']
+        assert_error(data, 'Resource Already Exists', 'RESOURCE_ALREADY_EXISTS', 'User already exists with email: user1@example.com')
     
+    def test_update_user_conflict_exact_body(self, client, create_user):
+        """Test service error bodies are compact JSON with no trailing newline."""
+        create_user(username='user1', email='user1@example.com', age=30, role='admin')
+        user2 = create_user(username='user2', email='user2@example.com', age=25, role='user')
+        
+        response = client.patch(f'/api/users/{user2["id"]}', json={'username': 'user1'})
+        assert response.status_code == 409
+        assert response.mimetype == 'application/json'
+        assert response.get_data() == (
+            b'{"error":"Resource Already Exists","code":"RESOURCE_ALREADY_EXISTS",'
+            b'"message":"User already exists with username: user1","details":null,"request_id":null}'
+        )
+        
     def test_update_user_same_username_no_conflict(self, client, create_user):
         """Test updating a user with their own username succeeds."""
         user = create_user(username='testuser', email='test@example.com', age=30, role='admin')
@@ -822,4 +831,37 @@ class TestUpdateUser:
         assert updated_user['username'] == 'updateduser'
         assert updated_user['email'] == 'test@example.com'
         assert updated_user['age'] == 30
-        assert updated_user['role'] == 'user'
\ No newline at end of file
+        assert updated_user['role'] == 'user'
+
+class TestErrorHandlers:
+    """Test the application-wide JSON error handlers."""
+    
+    def test_unknown_url_returns_json_404(self, client):
+        """Test that an unknown URL returns the standard JSON error envelope."""
+        response = client.get('/api/does-not-exist')
+        assert response.status_code == 404
+        assert response.mimetype == 'application/json'
+        
+        data = response.get_json()
+        assert data['error'] == 'Resource Not Found'
+        assert data['code'] == 'RESOURCE_NOT_FOUND'
+        assert data['message'] == 'Resource not found'
+    
+    def test_http_errors_pass_through(self, client):
+        """Test that HTTP errors other than 404/500 keep their own status."""
+        response = client.put('/api/users')
+        assert response.status_code == 405
+    
+    def test_unhandled_exception_returns_json_500(self, client, monkeypatch):
+        """Test that an unhandled exception returns the standard JSON error envelope."""
+        def boom(**kwargs):
+            raise RuntimeError('boom')
+        monkeypatch.setattr(UserService, 'get_user', boom)
+        
+        response = client.get('/api/users/1')
+        assert response.status_code == 500
+        assert response.mimetype == 'application/json'
+        
+        data = response.get_json()
+        assert data['error'] == 'Internal Server Error'
+        assert data['code'] == 'INTERNAL_SERVER_ERROR'
@@ -1,7 +1,8 @@
 import pytest
 import os
 from unittest.mock import patch
-from config import Config, DevelopmentConfig, ProductionConfig, ConfigTesting, config
+from sqlalchemy.pool import StaticPool
+from config import Config, DevelopmentConfig, ProductionConfig, ConfigTesting, config, get_config
 
 
 class TestConfigBase:
@@ -13,8 +14,7 @@ class TestConfigBase:
         self.original_env = {}
         env_vars = [
             'SECRET_KEY', 'DATABASE_URL', 'LOG_LEVEL', 'LOG_DIR', 
-            'REQUEST_LOGGING_ENABLED', 'LOG_RETENTION_DAYS', 
-            'LOG_MAX_BYTES', 'LOG_BACKUP_COUNT'
+            'REQUEST_LOGGING_ENABLED', 'LOG_RETENTION_DAYS', 'DB_CREATE_ALL'
         ]
         
         for var in env_vars:
@@ -43,8 +43,6 @@ class TestConfigBase:
         assert config_obj.LOG_DIR == 'logs'
         assert config_obj.REQUEST_LOGGING_ENABLED is True
         assert config_obj.LOG_RETENTION_DAYS == 30
-        assert config_obj.LOG_MAX_BYTES == 10485760  # 10MB
-        assert config_obj.LOG_BACKUP_COUNT == 5
     
     def test_config_with_environment_variables(self):
         """Test Config class with environment variables."""
@@ -55,8 +53,6 @@ class TestConfigBase:
         os.environ['LOG_DIR'] = '/var/log/app'
         os.environ['REQUEST_LOGGING_ENABLED'] = 'false'
         os.environ['LOG_RETENTION_DAYS'] = '60'
-        os.environ['LOG_MAX_BYTES'] = '20971520'  # 20MB
-        os.environ['LOG_BACKUP_COUNT'] = '10'
         
         config_obj = Config()
         
@@ -67,8 +63,6 @@ class TestConfigBase:
         assert config_obj.LOG_DIR == '/var/log/app'
         assert config_obj.REQUEST_LOGGING_ENABLED is False
         assert config_obj.LOG_RETENTION_DAYS == 60
-        assert config_obj.LOG_MAX_BYTES == 20971520
-        assert config_obj.LOG_BACKUP_COUNT == 10
     
     def test_config_request_logging_enabled_parsing(self):
         """Test REQUEST_LOGGING_ENABLED parsing from environment."""
@@ -91,18 +85,27 @@ class TestConfigBase:
             assert config_obj.REQUEST_LOGGING_ENABLED == expected, f"Failed for input '{env_value}'"
             del os.environ['REQUEST_LOGGING_ENABLED']
     
+    def test_config_db_create_all_parsing(self):
+        """Test DB_CREATE_ALL parsing from environment."""
+        assert Config().DB_CREATE_ALL is True
+        
+        for env_value, expected in [('true', True), ('1', True), ('false', False), ('0', False), ('off', False)]:
+            os.environ['DB_CREATE_ALL'] = env_value
+            assert Config().DB_CREATE_ALL == expected, f"Failed for input '{env_value}'"
+            del os.environ['DB_CREATE_ALL']
+    
+    def test_config_log_exclude_paths_default(self):
+        """Test LOG_EXCLUDE_PATHS excludes the health check by default."""
+        assert Config().LOG_EXCLUDE_PATHS == frozenset(('/health',))
+    
     def test_config_integer_parsing(self):
         """Test integer parsing from environment variables."""
         # Test valid integers
         os.environ['LOG_RETENTION_DAYS'] = '45'
-        os.environ['LOG_MAX_BYTES'] = '15728640'
-        os.environ['LOG_BACKUP_COUNT'] = '7'
         
         config_obj = Config()
         
         assert config_obj.LOG_RETENTION_DAYS == 45
-        assert config_obj.LOG_MAX_BYTES == 15728640
-        assert config_obj.LOG_BACKUP_COUNT == 7
     
     def test_config_invalid_integer_parsing(self):
         """Test invalid integer parsing from environment variables."""
@@ -124,8 +127,6 @@ class TestConfigBase:
         assert config_obj.LOG_DIR is not None
         assert isinstance(config_obj.REQUEST_LOGGING_ENABLED, bool)
         assert isinstance(config_obj.LOG_RETENTION_DAYS, int)
-        assert isinstance(config_obj.LOG_MAX_BYTES, int)
-        assert isinstance(config_obj.LOG_BACKUP_COUNT, int)
     
     def test_config_sqlalchemy_track_modifications_always_false(self):
         """Test that SQLALCHEMY_TRACK_MODIFICATIONS is always False."""
@@ -268,6 +269,13 @@ class TestConfigTesting:
         
         assert config_obj.SQLALCHEMY_DATABASE_URI == 'sqlite:///:memory:'
     
+    def test_testing_config_static_pool(self):
+        """Test that ConfigTesting keeps the in-memory database on one shared connection."""
+        config_obj = ConfigTesting()
+        
+        assert config_obj.SQLALCHEMY_ENGINE_OPTIONS['poolclass'] is StaticPool
+        assert config_obj.SQLALCHEMY_ENGINE_OPTIONS['connect_args'] == {'check_same_thread': False}
+    
     def test_testing_config_csrf_disabled(self):
         """Test that ConfigTesting has CSRF disabled."""
         config_obj = ConfigTesting()
@@ -358,6 +366,29 @@ class TestConfigDictionary:
             assert hasattr(config_obj, 'SECRET_KEY')
             assert hasattr(config_obj, 'SQLALCHEMY_DATABASE_URI')
     
+    def test_get_config_returns_matching_instance(self):
+        """Test get_config instantiates the class registered for the name."""
+        for env, config_class in config.items():
+            assert isinstance(get_config(env), config_class)
+    
+    def test_get_config_is_memoized(self):
+        """Test get_config returns the same object on repeated calls."""
+        assert get_config('production') is get_config('production')
+    
+    def test_get_config_reads_environment_once(self):
+        """Test get_config does not re-read environment variables once cached."""
+        get_config.cache_clear()
+        try:
+            with patch.dict(os.environ, {'SECRET_KEY': 'first-key'}):
+                first = get_config('production')
+            with patch.dict(os.environ, {'SECRET_KEY': 'second-key'}):
+                second = get_config('production')
+            
+            assert first is second
+            assert second.SECRET_KEY == 'first-key'
+        finally:
+            get_config.cache_clear()
+    
     def test_config_default_is_development(self):
         """Test that default config is development config."""
         assert config['default'] == config['development']
@@ -404,59 +435,28 @@ class TestConfigEdgeCases:
         del os.environ['DATABASE_URL']
         del os.environ['LOG_DIR']
     
-    def test_config_with_zero_values(self):
-        """Test Config with zero values in environment."""
-        os.environ['LOG_RETENTION_DAYS'] = '0'
-        os.environ['LOG_MAX_BYTES'] = '0'
-        os.environ['LOG_BACKUP_COUNT'] = '0'
-        
-        config_obj = Config()
-        
-        # Should accept zero values
-        assert config_obj.LOG_RETENTION_DAYS == 0
-        assert config_obj.LOG_MAX_BYTES == 0
-        assert config_obj.LOG_BACKUP_COUNT == 0
-        
-        # Clean up
-        del os.environ['LOG_RETENTION_DAYS']
-        del os.environ['LOG_MAX_BYTES']
-        del os.environ['LOG_BACKUP_COUNT']
-    
-    def test_config_with_negative_values(self):
-        """Test Config with negative values in environment."""
-        os.environ['LOG_RETENTION_DAYS'] = '-1'
-        os.environ['LOG_MAX_BYTES'] = '-1000'
-        os.environ['LOG_BACKUP_COUNT'] = '-5'
-        
-        config_obj = Config()
+    @pytest.mark.parametrize('value', ['0', '-1'])
+    def test_config_rejects_retention_below_one(self, value):
+        """Test Config rejects LOG_RETENTION_DAYS values below 1."""
+        os.environ['LOG_RETENTION_DAYS'] = value
         
-        # Should accept negative values (though they may not make sense)
-        assert config_obj.LOG_RETENTION_DAYS == -1
-        assert config_obj.LOG_MAX_BYTES == -1000
-        assert config_obj.LOG_BACKUP_COUNT == -5
+        with pytest.raises(ValueError, match='LOG_RETENTION_DAYS'):
+            Config()
         
         # Clean up
         del os.environ['LOG_RETENTION_DAYS']
-        del os.environ['LOG_MAX_BYTES']
-        del os.environ['LOG_BACKUP_COUNT']
     
     def test_config_with_very_large_values(self):
         """Test Config with very large values in environment."""
         os.environ['LOG_RETENTION_DAYS'] = '999999'
-        os.environ['LOG_MAX_BYTES'] = '1073741824'  # 1GB
-        os.environ['LOG_BACKUP_COUNT'] = '100'
         
         config_obj = Config()
         
         # Should accept large values
         assert config_obj.LOG_RETENTION_DAYS == 999999
-        assert config_obj.LOG_MAX_BYTES == 1073741824
-        assert config_obj.LOG_BACKUP_COUNT == 100
         
         # Clean up
         del os.environ['LOG_RETENTION_DAYS']
-        del os.environ['LOG_MAX_BYTES']
-        del os.environ['LOG_BACKUP_COUNT']
     
     def test_config_attribute_access(self):
         """Test that config attributes can be accessed like class attributes."""
@@ -470,8 +470,9 @@ class TestConfigEdgeCases:
         assert hasattr(config_obj, 'LOG_DIR')
         assert hasattr(config_obj, 'REQUEST_LOGGING_ENABLED')
         assert hasattr(config_obj, 'LOG_RETENTION_DAYS')
-        assert hasattr(config_obj, 'LOG_MAX_BYTES')
-        assert hasattr(config_obj, 'LOG_BACKUP_COUNT')
+        # Rotation is daily; the old size-based settings are gone
+        assert not hasattr(config_obj, 'LOG_MAX_BYTES')
+        assert not hasattr(config_obj, 'LOG_BACKUP_COUNT')
         
         # Test that we can read the values
         _ = config_obj.SECRET_KEY
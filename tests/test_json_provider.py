@@ -0,0 +1,83 @@
+import pytest
+import json
+from flask import Flask, jsonify
+from json_provider import PydanticJSONProvider
+
+
+@pytest.fixture
+def json_app():
+    """Create a bare Flask app using the pydantic-core JSON provider."""
+    app = Flask(__name__)
+    app.json = PydanticJSONProvider(app)
+    return app
+
+
+class TestPydanticJSONProvider:
+    """Test the PydanticJSONProvider class."""
+    
+    def test_dumps_returns_standard_json(self, json_app):
+        """Test dumps produces JSON readable by the stdlib."""
+        data = {'users': [{'id': 1, 'username': 'alice', 'age': 30}], 'note': '中文'}
+        
+        result = json_app.json.dumps(data)
+        
+        assert isinstance(result, str)
+        assert json.loads(result) == data
+    
+    def test_dumps_preserves_key_order(self, json_app):
+        """Test dumps keeps insertion order instead of sorting keys."""
+        result = json_app.json.dumps({'b': 1, 'a': 2})
+        
+        assert result == '{"b":1,"a":2}'
+    
+    def test_dumps_uses_flask_default_fallback(self, json_app):
+        """Test values unknown to pydantic-core fall back to Flask's default handler."""
+        class HTML:
+            def __html__(self):
+                return '<b>bold</b>'
+        
+        assert json.loads(json_app.json.dumps({'value': HTML()})) == {'value': '<b>bold</b>'}
+    
+    def test_dumps_unserializable_raises(self, json_app):
+        """Test unserializable values still raise an error."""
+        with pytest.raises(Exception):
+            json_app.json.dumps({'value': object()})
+    
+    def test_loads_accepts_str_and_bytes(self, json_app):
+        """Test loads decodes both text and UTF-8 bytes."""
+        assert json_app.json.loads('{"a": [1, 2]}') == {'a': [1, 2]}
+        assert json_app.json.loads(b'{"a": "\xc3\xa9"}') == {'a': 'é'}
+    
+    def test_loads_invalid_json_raises_value_error(self, json_app):
+        """Test loads raises ValueError for invalid JSON, like json.loads."""
+        with pytest.raises(ValueError):
+            json_app.json.loads('{invalid json}')
+    
+    def test_jsonify_response(self, json_app):
+        """Test jsonify builds a compact application/json response."""
+        with json_app.app_context():
+            response = jsonify({'status': 'ok', 'count': 2})
+        
+        assert response.mimetype == 'application/json'
+        assert response.get_data() == b'{"status":"ok","count":2}\n'
+    
+    def test_jsonify_indents_in_debug(self, json_app):
+        """Test jsonify pretty-prints when the app is in debug mode."""
+        json_app.debug = True
+        
+        with json_app.app_context():
+            response = jsonify({'status': 'ok'})
+        
+        assert response.get_data() == b'{\n  "status": "ok"\n}\n'
+    
+    def test_request_get_json_uses_provider(self, json_app):
+        """Test request bodies are decoded through the provider."""
+        @json_app.route('/echo', methods=['POST'])
+        def echo():
+            from flask import request
+            return jsonify(request.get_json())
+        
+        response = json_app.test_client().post('/echo', data='{"amount": 1.5}', content_type='application/json')
+        
+        assert response.status_code == 200
+        assert response.get_json() == {'amount': 1.5}
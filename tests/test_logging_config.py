@@ -1,10 +1,17 @@
 import pytest
 import logging
+import logging.handlers
 import os
 import tempfile
 import shutil
 from unittest.mock import Mock, patch, MagicMock
-from logging_config import setup_logging, get_logger, get_request_logger
+import logging_config
+from logging_config import setup_logging, get_logger, get_request_logger, _json_dumps
+
+
+def queued_file_handlers():
+    """Return the file handlers attached to the active queue listener."""
+    return list(logging_config._queue_listener.handlers)
 
 
 class TestLoggingConfig:
@@ -12,6 +19,8 @@ class TestLoggingConfig:
     
     def setup_method(self):
         """Set up test environment before each test."""
+        get_logger.cache_clear()
+        
         # Create a temporary directory for test logs
         self.test_log_dir = tempfile.mkdtemp()
         self.original_log_dir = os.environ.get('LOG_DIR')
@@ -30,6 +39,7 @@ class TestLoggingConfig:
             shutil.rmtree(self.test_log_dir)
         
         # Reset logging configuration
+        logging_config._stop_queue_listener()
         logging.getLogger().handlers.clear()
         logging.getLogger().setLevel(logging.WARNING)
     
@@ -55,16 +65,52 @@ class TestLoggingConfig:
         requests_log = os.path.join(self.test_log_dir, 'requests.log')
         
         # Files might not exist until first log message, so we'll check handlers
-        root_logger = logging.getLogger()
-        
-        # Check that file handlers were added
-        file_handlers = [h for h in root_logger.handlers if hasattr(h, 'baseFilename')]
+        file_handlers = [h for h in queued_file_handlers() if hasattr(h, 'baseFilename')]
         assert len(file_handlers) >= 1
         
         # Check that at least one handler points to our log directory
         log_files = [h.baseFilename for h in file_handlers]
         assert any(self.test_log_dir in log_file for log_file in log_files)
     
+    def test_setup_logging_routes_files_through_queue(self):
+        """Test that file handlers sit behind a QueueHandler, not on the root logger."""
+        setup_logging()
+        
+        root_logger = logging.getLogger()
+        queue_handlers = [h for h in root_logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+        
+        assert len(queue_handlers) == 1
+        assert not [h for h in root_logger.handlers if hasattr(h, 'baseFilename')]
+        assert logging_config._queue_listener._thread is not None
+    
+    def test_setup_logging_writes_records_via_listener(self):
+        """Test that records reach the log files once the listener drains the queue."""
+        setup_logging()
+        
+        logging.getLogger('requests').info('request record')
+        logging.getLogger('app').info('app record')
+        logging_config._stop_queue_listener()
+        
+        with open(os.path.join(self.test_log_dir, 'user_server.log')) as f:
+            server_log = f.read()
+        with open(os.path.join(self.test_log_dir, 'requests.log')) as f:
+            requests_log = f.read()
+        
+        assert 'request record' in server_log
+        assert 'app record' in server_log
+        assert 'request record' in requests_log
+        assert 'app record' not in requests_log
+    
+    def test_repeated_setup_replaces_queue_handler(self):
+        """Test that calling setup_logging again does not stack queue handlers."""
+        setup_logging()
+        setup_logging()
+        
+        root_logger = logging.getLogger()
+        queue_handlers = [h for h in root_logger.handlers if isinstance(h, logging.handlers.QueueHandler)]
+        
+        assert len(queue_handlers) == 1
+    
     def test_setup_logging_configures_log_level(self):
         """Test that setup_logging configures the correct log level."""
         setup_logging()
@@ -86,14 +132,13 @@ class TestLoggingConfig:
         """Test that setup_logging adds rotating file handlers."""
         setup_logging()
         
-        root_logger = logging.getLogger()
-        rotating_handlers = [h for h in root_logger.handlers if hasattr(h, 'maxBytes')]
+        rotating_handlers = [h for h in queued_file_handlers() if hasattr(h, 'rolloverAt')]
         
         assert len(rotating_handlers) >= 1
         
         # Check that handlers have correct rotation settings
         for handler in rotating_handlers:
-            assert handler.maxBytes == 10 * 1024 * 1024  # 10MB
+            assert handler.when == 'MIDNIGHT'
             assert handler.backupCount >= 5
     
     @patch('logging_config.structlog')
@@ -120,6 +165,26 @@ class TestLoggingConfig:
         assert call_args.kwargs['context_class'] == dict
         assert call_args.kwargs['cache_logger_on_first_use'] is True
     
+    def test_json_dumps_matches_stdlib_output(self):
+        """Test the structlog serializer produces standard JSON."""
+        import json
+        
+        event = {'event': 'Request completed', 'status_code': 200, 'path': '/api/users', 'user': '中文'}
+        
+        assert json.loads(_json_dumps(event)) == event
+    
+    def test_json_dumps_decodes_bytes_and_uses_default(self):
+        """Test the structlog serializer handles bytes and unknown types."""
+        import json
+        
+        class Unknown:
+            def __repr__(self):
+                return '<unknown>'
+        
+        result = json.loads(_json_dumps({'body': b'raw', 'obj': Unknown()}, default=repr))
+        
+        assert result == {'body': 'raw', 'obj': '<unknown>'}
+    
     def test_setup_logging_with_custom_log_dir(self):
         """Test setup_logging with custom log directory."""
         custom_log_dir = tempfile.mkdtemp()
@@ -133,8 +198,7 @@ class TestLoggingConfig:
             assert os.path.exists(custom_log_dir)
             
             # Check that file handlers point to custom directory
-            root_logger = logging.getLogger()
-            file_handlers = [h for h in root_logger.handlers if hasattr(h, 'baseFilename')]
+            file_handlers = [h for h in queued_file_handlers() if hasattr(h, 'baseFilename')]
             
             log_files = [h.baseFilename for h in file_handlers]
             assert any(custom_log_dir in log_file for log_file in log_files)
@@ -172,6 +236,19 @@ class TestLoggingConfig:
         mock_structlog.get_logger.assert_called_with('test_logger')
         assert logger == mock_logger
     
+    @patch('logging_config.structlog')
+    def test_get_logger_is_cached_per_name(self, mock_structlog):
+        """Test get_logger only asks structlog once per logger name."""
+        mock_structlog.get_logger.side_effect = lambda name: Mock(name=str(name))
+        
+        first = get_logger('cached')
+        second = get_logger('cached')
+        other = get_logger('other')
+        
+        assert first is second
+        assert other is not first
+        assert mock_structlog.get_logger.call_count == 2
+    
     @patch('logging_config.structlog')
     def test_get_request_logger(self, mock_structlog):
         """Test get_request_logger function."""
@@ -224,7 +301,7 @@ class TestLoggingConfig:
         
         with patch('os.path.exists') as mock_exists:
             with patch('os.makedirs') as mock_makedirs:
-                with patch('logging.handlers.RotatingFileHandler') as mock_handler:
+                with patch('logging.handlers.TimedRotatingFileHandler') as mock_handler:
                     mock_exists.return_value = False
                     
                     setup_logging()
@@ -251,17 +328,36 @@ class TestLoggingConfig:
         """Test that log file rotation settings are correct."""
         setup_logging()
         
-        root_logger = logging.getLogger()
-        rotating_handlers = [h for h in root_logger.handlers if hasattr(h, 'maxBytes')]
+        rotating_handlers = [h for h in queued_file_handlers() if hasattr(h, 'rolloverAt')]
         
         assert len(rotating_handlers) >= 1
         
         for handler in rotating_handlers:
-            # Check max file size (10MB)
-            assert handler.maxBytes == 10 * 1024 * 1024
+            # Check daily rotation in UTC
+            assert handler.when == 'MIDNIGHT'
+            assert handler.utc is True
             
-            # Check backup count
-            assert handler.backupCount >= 5
+            # Check backup count defaults to the 30 day retention
+            assert handler.backupCount == 30
+    
+    def test_log_retention_days_sets_backup_count(self):
+        """Test that the retention setting controls how many rotated files are kept."""
+        setup_logging(retention_days=7)
+        
+        for handler in queued_file_handlers():
+            assert handler.backupCount == 7
+    
+    def test_retention_below_one_rejected(self):
+        """Test that a retention of 0 days is rejected instead of keeping files forever."""
+        with pytest.raises(ValueError):
+            setup_logging(retention_days=0)
+    
+    def test_log_files_opened_lazily(self):
+        """Test that log files are not opened until the first record is written."""
+        setup_logging()
+        
+        for handler in queued_file_handlers():
+            assert handler.stream is None
     
     def test_log_message_format(self):
         """Test that log messages have correct format."""
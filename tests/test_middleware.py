@@ -1,7 +1,10 @@
+import logging
+import os
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from flask import Flask, g, request
-from middleware.request_logging import RequestLoggingMiddleware
+from middleware.request_logging import RequestLoggingMiddleware, next_request_id
+import middleware.request_logging as request_logging
 
 
 class TestRequestLoggingMiddleware:
@@ -35,19 +38,18 @@ class TestRequestLoggingMiddleware:
         assert middleware.logger == mock_get_logger.return_value
     
     def test_before_request_sets_globals(self):
-        """Test before_request sets g.start_time and g.request_id."""
+        """Test before_request sets g.start_ns and g.request_id."""
         app = Flask(__name__)
         middleware = RequestLoggingMiddleware()
         
         with app.test_request_context('/test'):
-            with patch('middleware.request_logging.time.time', return_value=1234567890.0):
-                with patch('middleware.request_logging.uuid.uuid4') as mock_uuid:
-                    mock_uuid.return_value.__str__ = Mock(return_value='test-uuid')
+            with patch('middleware.request_logging.time.perf_counter_ns', return_value=1_000_000_000):
+                with patch('middleware.request_logging.next_request_id', return_value='test-uuid'):
                     middleware.before_request()
                     
-                    assert hasattr(g, 'start_time')
+                    assert hasattr(g, 'start_ns')
                     assert hasattr(g, 'request_id')
-                    assert g.start_time == 1234567890.0
+                    assert g.start_ns == 1_000_000_000
                     assert g.request_id == 'test-uuid'
     
     @patch('middleware.request_logging.get_request_logger')
@@ -64,9 +66,8 @@ class TestRequestLoggingMiddleware:
         with app.test_request_context('/test', method='POST', 
                                      headers={'User-Agent': 'test-agent', 'Content-Type': 'application/json'},
                                      query_string='param=value'):
-            with patch('middleware.request_logging.time.time', return_value=1234567890.0):
-                with patch('middleware.request_logging.uuid.uuid4') as mock_uuid:
-                    mock_uuid.return_value.__str__ = Mock(return_value='test-uuid')
+            with patch('middleware.request_logging.time.perf_counter_ns', return_value=1_000_000_000):
+                with patch('middleware.request_logging.next_request_id', return_value='test-uuid'):
                     middleware.before_request()
                     
                     # Verify logger was called
@@ -80,6 +81,78 @@ class TestRequestLoggingMiddleware:
                     assert kwargs['user_agent'] == 'test-agent'
                     assert kwargs['content_type'] == 'application/json'
     
+    def test_before_request_logs_allowed_headers_only(self):
+        """Test before_request only logs allow-listed request headers."""
+        app = Flask(__name__)
+        mock_logger = Mock()
+        
+        middleware = RequestLoggingMiddleware()
+        middleware.logger = mock_logger
+        
+        with app.test_request_context('/test', headers={
+            'User-Agent': 'test-agent',
+            'Referer': 'http://example.com',
+            'Authorization': 'Bearer secret',
+            'Cookie': 'session=secret',
+        }):
+            middleware.before_request()
+            
+            _, kwargs = mock_logger.info.call_args
+            assert kwargs['headers'] == {'User-Agent': 'test-agent', 'Referer': 'http://example.com'}
+    
+    def test_client_ip_resolved_once_per_request(self):
+        """Test the client IP is resolved in before_request and reused afterwards."""
+        app = Flask(__name__)
+        middleware = RequestLoggingMiddleware()
+        middleware.logger = Mock()
+        
+        with app.test_request_context('/test', headers={'X-Forwarded-For': '192.168.1.1', 'User-Agent': 'test-agent'}):
+            with patch.object(middleware, 'get_client_ip', wraps=middleware.get_client_ip) as mock_get_ip:
+                middleware.before_request()
+                
+                response = Mock()
+                response.headers = {}
+                middleware.after_request(response)
+                middleware.teardown_request(ValueError("Test error"))
+                
+                mock_get_ip.assert_called_once()
+            
+            _, kwargs = middleware.logger.info.call_args
+            assert kwargs['remote_addr'] == '192.168.1.1'
+            assert kwargs['user_agent'] == 'test-agent'
+            _, kwargs = middleware.logger.error.call_args
+            assert kwargs['remote_addr'] == '192.168.1.1'
+    
+    def test_logging_skipped_when_info_disabled(self):
+        """Test no log records are built when the request logger filters out INFO."""
+        app = Flask(__name__)
+        mock_logger = Mock()
+        mock_logger.isEnabledFor.return_value = False
+        
+        middleware = RequestLoggingMiddleware()
+        middleware.logger = mock_logger
+        
+        with app.test_request_context('/test'):
+            middleware.before_request()
+            
+            response = Mock()
+            response.headers = {}
+            result = middleware.after_request(response)
+            
+            mock_logger.info.assert_not_called()
+            response.calculate_content_length.assert_not_called()
+            assert result == response
+            assert response.headers['X-Request-ID'] == g.request_id
+    
+    def test_info_enabled_with_native_structlog_logger(self):
+        """Test info_enabled falls back to is_enabled_for on native structlog loggers."""
+        middleware = RequestLoggingMiddleware()
+        middleware.logger = Mock(spec=['info', 'is_enabled_for'])
+        middleware.logger.is_enabled_for.return_value = False
+        
+        assert middleware.info_enabled() is False
+        middleware.logger.is_enabled_for.assert_called_once_with(logging.INFO)
+    
     def test_get_client_ip_with_forwarded_for(self):
         """Test get_client_ip with X-Forwarded-For header."""
         app = Flask(__name__)
@@ -134,17 +207,17 @@ class TestRequestLoggingMiddleware:
         
         with app.test_request_context('/test'):
             # Set up g values as if before_request was called
-            g.start_time = 1234567890.0
+            g.start_ns = 1_000_000_000
             g.request_id = 'test-uuid'
             
             # Create a mock response
             response = Mock()
             response.status_code = 200
             response.status = '200 OK'
-            response.get_data.return_value = b'{"result": "success"}'
+            response.calculate_content_length.return_value = len(b'{"result": "success"}')
             response.headers = {'Content-Type': 'application/json'}
             
-            with patch('middleware.request_logging.time.time', return_value=1234567890.5):
+            with patch('middleware.request_logging.time.perf_counter_ns', return_value=1_500_000_000):
                 result = middleware.after_request(response)
                 
                 # Verify response is returned unchanged
@@ -158,7 +231,7 @@ class TestRequestLoggingMiddleware:
                 assert kwargs['request_id'] == 'test-uuid'
                 assert kwargs['status_code'] == 200
                 assert kwargs['status'] == '200 OK'
-                assert kwargs['duration_seconds'] == 0.5
+                assert kwargs['duration_us'] == 500_000
                 assert kwargs['response_size'] == 21  # Length of response data
     
     def test_after_request_adds_request_id_header(self):
@@ -172,7 +245,7 @@ class TestRequestLoggingMiddleware:
             response = Mock()
             response.status_code = 200
             response.status = '200 OK'
-            response.get_data.return_value = b'test'
+            response.calculate_content_length.return_value = len(b'test')
             response.headers = {}
             
             middleware.after_request(response)
@@ -181,21 +254,21 @@ class TestRequestLoggingMiddleware:
             assert response.headers['X-Request-ID'] == 'test-uuid'
     
     def test_after_request_handles_missing_start_time(self):
-        """Test after_request handles case where start_time is not set."""
+        """Test after_request handles case where start_ns is not set."""
         app = Flask(__name__)
         middleware = RequestLoggingMiddleware()
         
         with app.test_request_context('/test'):
             g.request_id = 'test-uuid'
-            # Don't set g.start_time
+            # Don't set g.start_ns
             
             response = Mock()
             response.status_code = 200
             response.status = '200 OK'
-            response.get_data.return_value = b'test'
+            response.calculate_content_length.return_value = len(b'test')
             response.headers = {}
             
-            with patch('middleware.request_logging.time.time', return_value=1234567890.5):
+            with patch('middleware.request_logging.time.perf_counter_ns', return_value=1_500_000_000):
                 result = middleware.after_request(response)
                 
                 # Should not raise an exception
@@ -207,13 +280,13 @@ class TestRequestLoggingMiddleware:
         middleware = RequestLoggingMiddleware()
         
         with app.test_request_context('/test'):
-            g.start_time = 1234567890.0
+            g.start_ns = 1_000_000_000
             # Don't set g.request_id
             
             response = Mock()
             response.status_code = 200
             response.status = '200 OK'
-            response.get_data.return_value = b'test'
+            response.calculate_content_length.return_value = len(b'test')
             response.headers = {}
             
             result = middleware.after_request(response)
@@ -234,13 +307,13 @@ class TestRequestLoggingMiddleware:
         middleware.logger = mock_logger
         
         with app.test_request_context('/test'):
-            g.start_time = 1234567890.0
+            g.start_ns = 1_000_000_000
             g.request_id = 'test-uuid'
             
             # Create a test exception
             exception = ValueError("Test error")
             
-            with patch('middleware.request_logging.time.time', return_value=1234567890.5):
+            with patch('middleware.request_logging.time.perf_counter_ns', return_value=1_500_000_000):
                 middleware.teardown_request(exception)
                 
                 # Verify logger was called
@@ -249,7 +322,7 @@ class TestRequestLoggingMiddleware:
                 
                 assert args[0] == "Request failed with exception"
                 assert kwargs['request_id'] == 'test-uuid'
-                assert kwargs['duration_seconds'] == 0.5
+                assert kwargs['duration_us'] == 500_000
                 assert kwargs['exception'] == 'Test error'
                 assert kwargs['exception_type'] == 'ValueError'
     
@@ -268,7 +341,7 @@ class TestRequestLoggingMiddleware:
         middleware = RequestLoggingMiddleware()
         
         with app.test_request_context('/test'):
-            # Don't set g.start_time or g.request_id
+            # Don't set g.start_ns or g.request_id
             exception = ValueError("Test error")
             
             # Should not raise an exception
@@ -313,6 +386,42 @@ class TestRequestLoggingMiddleware:
             # Verify X-Request-ID header is present
             assert 'X-Request-ID' in response.headers
     
+    def test_init_app_reads_exclude_paths(self):
+        """Test init_app picks up LOG_EXCLUDE_PATHS from the app config."""
+        app = Flask(__name__)
+        app.config['LOG_EXCLUDE_PATHS'] = ['/health', '/metrics']
+        
+        middleware = RequestLoggingMiddleware(app)
+        
+        assert middleware.exclude_paths == frozenset(('/health', '/metrics'))
+    
+    def test_excluded_path_is_not_logged(self):
+        """Test requests to excluded paths produce no log records or request ID."""
+        app = Flask(__name__)
+        app.config['LOG_EXCLUDE_PATHS'] = frozenset(('/health',))
+        
+        mock_logger = Mock()
+        middleware = RequestLoggingMiddleware(app)
+        middleware.logger = mock_logger
+        
+        @app.route('/health')
+        def health():
+            return 'healthy'
+        
+        @app.route('/test')
+        def test_route():
+            return 'Test response'
+        
+        with app.test_client() as client:
+            response = client.get('/health')
+            assert response.status_code == 200
+            assert 'X-Request-ID' not in response.headers
+            mock_logger.info.assert_not_called()
+            
+            response = client.get('/test')
+            assert 'X-Request-ID' in response.headers
+            assert mock_logger.info.call_count == 2
+    
     def test_middleware_with_json_request(self):
         """Test middleware with JSON request."""
         app = Flask(__name__)
@@ -324,7 +433,7 @@ class TestRequestLoggingMiddleware:
             # Should handle JSON request without error
             middleware.before_request()
             
-            assert hasattr(g, 'start_time')
+            assert hasattr(g, 'start_ns')
             assert hasattr(g, 'request_id')
     
     def test_middleware_with_large_response(self):
@@ -333,7 +442,7 @@ class TestRequestLoggingMiddleware:
         middleware = RequestLoggingMiddleware()
         
         with app.test_request_context('/test'):
-            g.start_time = 1234567890.0
+            g.start_ns = 1_000_000_000
             g.request_id = 'test-uuid'
             
             # Create a large response
@@ -341,7 +450,7 @@ class TestRequestLoggingMiddleware:
             response = Mock()
             response.status_code = 200
             response.status = '200 OK'
-            response.get_data.return_value = large_data.encode()
+            response.calculate_content_length.return_value = len(large_data.encode())
             response.headers = {}
             
             result = middleware.after_request(response)
@@ -358,7 +467,7 @@ class TestRequestLoggingMiddleware:
             # Should handle special characters without error
             middleware.before_request()
             
-            assert hasattr(g, 'start_time')
+            assert hasattr(g, 'start_ns')
             assert hasattr(g, 'request_id')
 
 
@@ -381,4 +490,56 @@ class TestRequestLoggingMiddlewareInitFunction:
         # Verify hooks are registered
         assert len(app.before_request_funcs[None]) >= 1
         assert len(app.after_request_funcs[None]) >= 1
-        assert len(app.teardown_appcontext_funcs) >= 1 
\ No newline at end of file
+        assert len(app.teardown_appcontext_funcs) >= 1 
+
+
+class TestNextRequestId:
+    """Test the pooled request ID generator."""
+    
+    def setup_method(self):
+        """Start each test from an empty entropy pool."""
+        request_logging._reset_entropy_pool()
+    
+    def test_request_id_is_hex(self):
+        """Test request IDs are 32 lowercase hex characters."""
+        request_id = next_request_id()
+        
+        assert len(request_id) == 32
+        int(request_id, 16)
+        assert request_id == request_id.lower()
+    
+    def test_request_ids_are_unique(self):
+        """Test consecutive request IDs differ."""
+        ids = {next_request_id() for _ in range(1000)}
+        
+        assert len(ids) == 1000
+    
+    def test_pool_is_refilled_once_exhausted(self):
+        """Test entropy is read in pool-sized chunks, not per request."""
+        ids_per_pool = request_logging.ENTROPY_POOL_BYTES // request_logging.REQUEST_ID_BYTES
+        
+        with patch('middleware.request_logging.os.urandom', wraps=os.urandom) as mock_urandom:
+            for _ in range(ids_per_pool):
+                next_request_id()
+            assert mock_urandom.call_count == 1
+            
+            next_request_id()
+            assert mock_urandom.call_count == 2
+            mock_urandom.assert_called_with(request_logging.ENTROPY_POOL_BYTES)
+    
+    def test_pool_is_per_thread(self):
+        """Test each thread draws from its own pool."""
+        import threading
+        
+        results = []
+        thread = threading.Thread(target=lambda: results.append(next_request_id()))
+        
+        pools = [b'\x00' * request_logging.ENTROPY_POOL_BYTES, b'\x11' * request_logging.ENTROPY_POOL_BYTES]
+        
+        with patch('middleware.request_logging.os.urandom', side_effect=pools):
+            main_id = next_request_id()
+            thread.start()
+            thread.join()
+        
+        assert main_id == '0' * 32
+        assert results == ['1' * 32]
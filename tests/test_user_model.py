@@ -42,6 +42,11 @@ class TestUserModel:
         """Test that the User model has the correct table name."""
         assert User.__tablename__ == 'users'
     
+    def test_user_role_indexed(self):
+        """Test the role column is indexed so role listings avoid a full scan."""
+        assert User.__table__.c.role.index is True
+        assert any(index.columns.keys() == ['role'] for index in User.__table__.indexes)
+    
     def test_user_to_dict(self):
         """Test the to_dict method."""
         user = User(
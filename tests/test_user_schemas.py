@@ -1,9 +1,20 @@
 import pytest
 from pydantic import ValidationError
-from schemas.user_schemas import UserSchema, UserCreateSchema, UserResponseSchema
+from schemas.user_schemas import UserSchema, UserCreateSchema, UserUpdateSchema, UserResponseSchema
 from schemas.error_schemas import ErrorResponse, ErrorCode, FieldError, ErrorResponseBuilder
 
 
+class TestSchemaBuild:
+    """Test schema validators are ready before the first request."""
+    
+    @pytest.mark.parametrize('model', [
+        UserSchema, UserCreateSchema, UserUpdateSchema, UserResponseSchema, ErrorResponse, FieldError
+    ])
+    def test_schema_built_at_import(self, model):
+        """Test validators are built at class definition, not on first use."""
+        assert model.__pydantic_complete__ is True
+
+
 class TestUserCreateSchema:
     """Test the UserCreateSchema validation."""
     
@@ -210,9 +221,36 @@ class TestUserCreateSchema:
             UserCreateSchema(**data)
         
         errors = exc_info.value.errors()
-        assert len(errors) == 1  # Only username has a minimum length constraint
+        assert len(errors) == 2  # username is too short and email is malformed
         assert errors[0]['loc'] == ('username',)
         assert errors[0]['type'] == 'string_too_short'
+        assert errors[1]['loc'] == ('email',)
+        assert errors[1]['type'] == 'value_error'
+    
+    @pytest.mark.parametrize('email', [
+        'not-an-email',
+        'missing-domain@',
+        '@missing-local.com',
+        'no-tld@example',
+        'two@at@example.com',
+        'has space@example.com',
+    ])
+    def test_invalid_email_format(self, email):
+        """Test emails that are not shaped like local@domain.tld are rejected."""
+        data = {
+            'username': 'testuser',
+            'email': email,
+            'age': 25,
+            'role': 'user'
+        }
+        
+        with pytest.raises(ValidationError) as exc_info:
+            UserCreateSchema(**data)
+        
+        errors = exc_info.value.errors()
+        assert len(errors) == 1
+        assert errors[0]['loc'] == ('email',)
+        assert errors[0]['type'] == 'value_error'
 
 
 class TestUserSchema:
@@ -236,6 +274,16 @@ class TestUserSchema:
         assert schema.age == 25
         assert schema.role == 'admin'
     
+    def test_user_schema_is_frozen(self):
+        """Test user schema instances reject attribute assignment."""
+        schema = UserSchema(id=1, username='testuser', email='test@example.com', age=25, role='admin')
+        
+        with pytest.raises(ValidationError) as exc_info:
+            schema.username = 'renamed'
+        
+        assert exc_info.value.errors()[0]['type'] == 'frozen_instance'
+        assert schema.username == 'testuser'
+    
     def test_user_schema_missing_id(self):
         """Test user schema validation when ID is missing."""
         data = {
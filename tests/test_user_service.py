@@ -1,7 +1,8 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 from sqlalchemy.exc import IntegrityError, DatabaseError
-from services.user_service import UserService
+from services.user_service import UserService, _GET_USER_STMT, _create_conflict
 from models.user import User
 from schemas.error_schemas import ErrorResponse, ErrorCode
 
@@ -194,6 +195,120 @@ class TestUserServiceCreateUser:
             mock_db.session.rollback.assert_called_once()
 
 
+class TestUserServiceCreateUserOnConflict:
+    """Test UserService.create_user against a backend with ON CONFLICT DO NOTHING."""
+    
+    def test_create_user_returns_inserted_row(self, db_session):
+        """Test the inserted user comes back from RETURNING with its id."""
+        # Act
+        user, error = UserService.create_user("testuser", "test@example.com", 25, "admin")
+        
+        # Assert
+        assert error is None
+        assert user.id is not None
+        assert db_session.get(User, user.id) is user
+    
+    @pytest.mark.parametrize("username, email, expected_message", [
+        ("testuser", "other@example.com", "User already exists with username: testuser"),
+        ("otheruser", "test@example.com", "User already exists with email: test@example.com"),
+    ])
+    def test_create_user_conflict_names_field(self, db_session, username, email, expected_message):
+        """Test a skipped insert reports the conflicting field without rolling back."""
+        # Arrange
+        UserService.create_user("testuser", "test@example.com", 25, "admin")
+        
+        # Act
+        with patch.object(db_session, 'rollback') as mock_rollback:
+            user, error = UserService.create_user(username, email, 30, "user")
+        
+        # Assert
+        assert user is None
+        assert error.code == ErrorCode.RESOURCE_ALREADY_EXISTS
+        assert error.message == expected_message
+        mock_rollback.assert_not_called()
+    
+    def test_create_conflict_row_gone(self, db_session):
+        """Test a conflicting row deleted before the lookup yields the generic constraint error."""
+        # Act
+        error = _create_conflict("testuser", "test@example.com")
+        
+        # Assert
+        assert error.code == ErrorCode.CONSTRAINT_VIOLATION
+        assert error.message == "A database constraint was violated"
+
+
+class TestUserServiceUpdateUser:
+    """Test the UserService.update_user method."""
+    
+    @patch('services.user_service.db')
+    def test_update_user_sets_updatable_fields(self, mock_db):
+        """Test only the user's updatable columns are written."""
+        # Arrange
+        existing_user = SimpleNamespace(id=1, username='testuser', email='test@example.com', age=30, role='user')
+        mock_db.session.get.return_value = existing_user
+        
+        # Act
+        user, error = UserService.update_user(1, {'username': 'renamed', 'age': 40, 'id': 99, 'is_admin': True})
+        
+        # Assert
+        assert error is None
+        assert user is existing_user
+        assert existing_user.username == 'renamed'
+        assert existing_user.age == 40
+        assert existing_user.id == 1
+        assert 'is_admin' not in vars(existing_user)
+        mock_db.session.commit.assert_called_once()
+    
+    @patch('services.user_service.db')
+    def test_update_user_email_conflict(self, mock_db):
+        """Test an update hitting the email constraint reports the conflicting email."""
+        # Arrange
+        mock_db.session.get.return_value = Mock()
+        integrity_error = IntegrityError("statement", "params", "orig")
+        integrity_error.orig = Mock()
+        integrity_error.orig.__str__ = Mock(return_value="UNIQUE constraint failed: users.email")
+        mock_db.session.commit.side_effect = integrity_error
+        
+        # Act
+        user, error = UserService.update_user(1, {'email': 'taken@example.com'})
+        
+        # Assert
+        assert user is None
+        assert error.code == ErrorCode.RESOURCE_ALREADY_EXISTS
+        assert "email: taken@example.com" in error.message
+        mock_db.session.rollback.assert_called_once()
+    
+    @patch('services.user_service.db')
+    def test_update_user_database_error(self, mock_db):
+        """Test an update failing in the database returns a database error."""
+        # Arrange
+        mock_db.session.get.return_value = Mock()
+        mock_db.session.commit.side_effect = DatabaseError("statement", "params", "orig")
+        
+        # Act
+        user, error = UserService.update_user(1, {'age': 40})
+        
+        # Assert
+        assert user is None
+        assert error.code == ErrorCode.DATABASE_ERROR
+        assert "updating user" in error.message
+        mock_db.session.rollback.assert_called_once()
+    
+    @patch('services.user_service.db')
+    def test_update_user_not_found(self, mock_db):
+        """Test updating a missing user returns a not-found error."""
+        # Arrange
+        mock_db.session.get.return_value = None
+        
+        # Act
+        user, error = UserService.update_user(999, {'username': 'renamed'})
+        
+        # Assert
+        assert user is None
+        assert error.code == ErrorCode.RESOURCE_NOT_FOUND
+        mock_db.session.commit.assert_not_called()
+
+
 class TestUserServiceGetUser:
     """Test the UserService.get_user method."""
     
@@ -203,129 +318,136 @@ class TestUserServiceGetUser:
         # Arrange
         mock_user = Mock()
         mock_user.id = 1
-        mock_db.session.get.return_value = mock_user
+        mock_db.session.execute.return_value.scalar_one_or_none.return_value = mock_user
         
         # Act
         user = UserService.get_user(1)
         
         # Assert
         assert user == mock_user
-        mock_db.session.get.assert_called_once_with(User, 1)
+        mock_db.session.execute.assert_called_once_with(_GET_USER_STMT, {'id': 1})
     
     @patch('services.user_service.db')
     def test_get_user_not_found(self, mock_db):
         """Test user retrieval when user doesn't exist."""
         # Arrange
-        mock_db.session.get.return_value = None
+        mock_db.session.execute.return_value.scalar_one_or_none.return_value = None
         
         # Act
         user = UserService.get_user(999)
         
         # Assert
         assert user is None
-        mock_db.session.get.assert_called_once_with(User, 999)
+        mock_db.session.execute.assert_called_once_with(_GET_USER_STMT, {'id': 999})
     
     @patch('services.user_service.db')
     def test_get_user_database_error(self, mock_db):
         """Test user retrieval with database error."""
         # Arrange
-        mock_db.session.get.side_effect = DatabaseError("statement", "params", "orig")
+        mock_db.session.execute.side_effect = DatabaseError("statement", "params", "orig")
         
         # Act
         user = UserService.get_user(1)
         
         # Assert
         assert user is None
-        mock_db.session.get.assert_called_once_with(User, 1)
+        mock_db.session.execute.assert_called_once_with(_GET_USER_STMT, {'id': 1})
 
 
-class TestUserServiceGetAllUsers:
-    """Test the UserService.get_all_users method."""
+class TestUserServiceIterAllUsers:
+    """Test the UserService.iter_all_users method."""
     
     @patch('services.user_service.db')
-    def test_get_all_users_success(self, mock_db):
-        """Test successful retrieval of all users."""
+    def test_iter_all_users_yields_batches(self, mock_db):
+        """Test users are yielded one batch at a time."""
         # Arrange
-        mock_users = [Mock(), Mock()]
-        mock_db.session.query.return_value.all.return_value = mock_users
+        batches = [[Mock(), Mock()], [Mock()]]
+        mock_db.session.scalars.return_value.partitions.return_value = iter(batches)
         
         # Act
-        users = UserService.get_all_users()
+        result = list(UserService.iter_all_users(batch_size=2))
         
         # Assert
-        assert users == mock_users
-        mock_db.session.query.assert_called_once_with(User)
+        assert result == batches
+        mock_db.session.scalars.assert_called_once()
     
     @patch('services.user_service.db')
-    def test_get_all_users_empty(self, mock_db):
-        """Test retrieval of all users when database is empty."""
+    def test_iter_all_users_database_error(self, mock_db):
+        """Test iteration stops cleanly on database error."""
         # Arrange
-        mock_db.session.query.return_value.all.return_value = []
+        mock_db.session.scalars.side_effect = DatabaseError("statement", "params", "orig")
         
         # Act
-        users = UserService.get_all_users()
+        result = list(UserService.iter_all_users())
         
         # Assert
-        assert users == []
-        mock_db.session.query.assert_called_once_with(User)
+        assert result == []
     
     @patch('services.user_service.db')
-    def test_get_all_users_database_error(self, mock_db):
-        """Test retrieval of all users with database error."""
+    def test_iter_all_users_database_error_mid_stream(self, mock_db):
+        """Test a database error after the first batch propagates."""
         # Arrange
-        mock_db.session.query.side_effect = DatabaseError("statement", "params", "orig")
+        def partitions():
+            yield ['batch1']
+            raise DatabaseError("statement", "params", "orig")
+        mock_db.session.scalars.return_value.partitions.return_value = partitions()
         
         # Act
-        users = UserService.get_all_users()
+        batches = UserService.iter_all_users()
         
         # Assert
-        assert users == []
-        mock_db.session.query.assert_called_once_with(User)
+        assert next(batches) == ['batch1']
+        with pytest.raises(DatabaseError):
+            next(batches)
 
 
-class TestUserServiceGetUsersByRole:
-    """Test the UserService.get_users_by_role method."""
+class TestUserServiceIterUsersByRole:
+    """Test the UserService.iter_users_by_role method."""
     
     @patch('services.user_service.db')
-    def test_get_users_by_role_success(self, mock_db):
-        """Test successful retrieval of users by role."""
+    def test_iter_users_by_role_yields_batches(self, mock_db):
+        """Test matching users are yielded one batch at a time."""
         # Arrange
-        mock_users = [Mock(), Mock()]
-        mock_db.session.query.return_value.filter.return_value.all.return_value = mock_users
+        batches = [[Mock()], [Mock()]]
+        mock_db.session.scalars.return_value.partitions.return_value = iter(batches)
         
         # Act
-        users = UserService.get_users_by_role("admin")
+        result = list(UserService.iter_users_by_role("admin", batch_size=1))
         
         # Assert
-        assert users == mock_users
-        mock_db.session.query.assert_called_once_with(User)
-        mock_db.session.query.return_value.filter.assert_called_once()
+        assert result == batches
+        statement = mock_db.session.scalars.call_args.args[0]
+        assert statement.get_execution_options()['yield_per'] == 1
+        assert 'WHERE users.role' in str(statement)
     
     @patch('services.user_service.db')
-    def test_get_users_by_role_empty(self, mock_db):
-        """Test retrieval of users by role when no users match."""
+    def test_iter_users_by_role_database_error(self, mock_db):
+        """Test iteration stops cleanly on database error."""
         # Arrange
-        mock_db.session.query.return_value.filter.return_value.all.return_value = []
+        mock_db.session.scalars.side_effect = DatabaseError("statement", "params", "orig")
         
         # Act
-        users = UserService.get_users_by_role("nonexistent")
+        result = list(UserService.iter_users_by_role("admin"))
         
         # Assert
-        assert users == []
-        mock_db.session.query.assert_called_once_with(User)
+        assert result == []
     
     @patch('services.user_service.db')
-    def test_get_users_by_role_database_error(self, mock_db):
-        """Test retrieval of users by role with database error."""
+    def test_iter_users_by_role_database_error_mid_stream(self, mock_db):
+        """Test a database error after the first batch propagates."""
         # Arrange
-        mock_db.session.query.side_effect = DatabaseError("statement", "params", "orig")
+        def partitions():
+            yield ['batch1']
+            raise DatabaseError("statement", "params", "orig")
+        mock_db.session.scalars.return_value.partitions.return_value = partitions()
         
         # Act
-        users = UserService.get_users_by_role("admin")
+        batches = UserService.iter_users_by_role("admin")
         
         # Assert
-        assert users == []
-        mock_db.session.query.assert_called_once_with(User)
+        assert next(batches) == ['batch1']
+        with pytest.raises(DatabaseError):
+            next(batches)
 
 
 class TestUserServiceDeleteUser: